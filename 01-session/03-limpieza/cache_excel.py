@@ -0,0 +1,205 @@
+"""
+Caché columnar de los libros de Excel del curso (CovidDiagnosis.xlsx,
+Thesaurus.xlsx...).
+
+``pd.read_excel`` analiza el XML del libro con openpyxl en cada sesión, lo
+que es lento incluso con archivos pequeños y se vuelve costoso con
+exportaciones grandes. Aquí cada libro se convierte una sola vez: todas sus
+hojas se leen en una pasada, se les aplican tipos explícitos (categorías
+para las columnas de pocos valores) y cada una se guarda como archivo Arrow
+IPC sin comprimir en ``.cache_excel/<libro>-<huella>/``, junto al libro. La
+huella es el SHA-256 del contenido del libro y de los tipos, así que editar
+el Excel o cambiar ``TIPOS`` genera una caché nueva (y borra la anterior).
+
+Las lecturas siguientes abren el archivo Arrow con ``memory_map``: no se
+copia nada hasta convertir a pandas, y solo se convierten las columnas
+pedidas (``columnas=[...]``). Las columnas categóricas se guardan como
+diccionarios de Arrow y llegan a pandas como ``category``.
+
+Uso:
+    from cache_excel import cargar
+    df = cargar('CovidDiagnosis.xlsx')
+    df = cargar('../../02-session/Thesaurus.xlsx', hoja='Hoja2',
+                columnas=['Término o Frase', 'Fecha'])
+
+    python cache_excel.py CovidDiagnosis.xlsx ../../Thesaurus1.xlsx   # convertir
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+
+DIRECTORIO = '.cache_excel'
+VERSION = 1        # cambia el formato de la caché -> invalida las existentes
+
+# Tipos por nombre de columna; el resto de columnas de texto pasan a 'string'
+# (las columnas mixtas, como Temperature o Fecha, no se pueden guardar en
+# Arrow como 'object').
+TIPOS = {
+    'Age': 'float64',
+    'Fever': 'float64',
+    'Gender': 'category',
+    'Headache': 'category',
+    'Hospital': 'category',
+    'CovidDiagnosis': 'category',
+}
+
+_huellas = {}      # (ruta, mtime, tamaño) -> huella, para no releer el libro
+
+
+def nombre_temporal(directorio, sufijo=''):
+    """Ruta libre en ``directorio`` para un temporal que luego se renombra.
+
+    No crea nada: quien la usa crea el archivo con ``open(..., 'x')`` o el
+    directorio con ``os.mkdir``, que aplican la umask como cualquier archivo
+    nuevo (``tempfile.mkstemp``/``mkdtemp`` usarían 0600/0700, y el rename
+    conservaría esos permisos).
+    """
+    return os.path.join(directorio, f'.tmp-{uuid.uuid4().hex}{sufijo}')
+
+
+# ============================================================================
+# Huella y ubicación de la caché
+# ============================================================================
+def huella(ruta, tipos=None):
+    """SHA-256 del libro, de los tipos y de la versión de la caché."""
+    tipos = TIPOS if tipos is None else tipos
+    st = os.stat(ruta)
+    firma = (os.path.abspath(ruta), st.st_mtime_ns, st.st_size,
+             json.dumps(tipos, sort_keys=True))
+    if firma not in _huellas:
+        h = hashlib.sha256(f'{VERSION}{firma[3]}'.encode())
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+        _huellas[firma] = h.hexdigest()
+    return _huellas[firma]
+
+
+def _base(ruta):
+    return re.sub(r'[^\w.-]', '_', os.path.splitext(os.path.basename(ruta))[0])
+
+
+def directorio_cache(ruta, tipos=None, directorio=None):
+    """Directorio de la caché de ``ruta`` para su contenido actual."""
+    raiz = directorio or os.path.join(os.path.dirname(os.path.abspath(ruta)), DIRECTORIO)
+    return os.path.join(raiz, f'{_base(ruta)}-{huella(ruta, tipos)[:16]}')
+
+
+# ============================================================================
+# Conversión
+# ============================================================================
+def _tipar(df, tipos):
+    """Aplica ``tipos`` y pasa a 'string' las columnas de texto sin tipo explícito."""
+    df.columns = [str(c) for c in df.columns]
+    for columna in df.columns:
+        if columna in tipos:
+            df[columna] = df[columna].astype(tipos[columna])
+        elif df[columna].dtype == object or pd.api.types.is_string_dtype(df[columna]):
+            df[columna] = df[columna].astype('string')
+    return df
+
+
+def convertir(ruta, tipos=None, directorio=None):
+    """Convierte todas las hojas de ``ruta`` a Arrow si no hay caché vigente.
+
+    Devuelve el directorio de la caché. La caché se escribe en un directorio
+    temporal que después se renombra, así una conversión interrumpida nunca
+    queda a medias; las cachés anteriores del mismo libro se eliminan.
+    """
+    tipos = TIPOS if tipos is None else tipos
+    destino = directorio_cache(ruta, tipos, directorio)
+    if os.path.isdir(destino):
+        return destino
+
+    raiz = os.path.dirname(destino)
+    os.makedirs(raiz, exist_ok=True)
+    hojas = pd.read_excel(ruta, sheet_name=None)
+    tmp = nombre_temporal(raiz)
+    os.mkdir(tmp)
+    try:
+        for i, df in enumerate(hojas.values()):
+            tabla = pa.Table.from_pandas(_tipar(df, tipos), preserve_index=False)
+            with pa.OSFile(os.path.join(tmp, f'{i}.arrow'), 'wb') as f, \
+                    pa.ipc.new_file(f, tabla.schema) as escritor:
+                escritor.write_table(tabla)
+        with open(os.path.join(tmp, 'hojas.json'), 'w', encoding='utf-8') as f:
+            json.dump(list(hojas), f, ensure_ascii=False)
+        os.replace(tmp, destino)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    prefijo = f'{_base(ruta)}-'
+    for entrada in os.scandir(raiz):
+        if entrada.name.startswith(prefijo) and entrada.path != destino:
+            shutil.rmtree(entrada.path, ignore_errors=True)
+    return destino
+
+
+# ============================================================================
+# Lectura
+# ============================================================================
+def hojas(ruta, tipos=None, directorio=None):
+    """Nombres de las hojas de ``ruta``, en el orden del libro."""
+    with open(os.path.join(convertir(ruta, tipos, directorio), 'hojas.json'),
+              encoding='utf-8') as f:
+        return json.load(f)
+
+
+def tabla(ruta, hoja=0, columnas=None, tipos=None, directorio=None):
+    """Hoja de ``ruta`` como ``pyarrow.Table`` mapeada en memoria (sin copias).
+
+    ``hoja`` es el nombre o la posición de la hoja (negativa, desde el
+    final; fuera de rango da ``IndexError``); ``columnas``, las columnas a
+    conservar, en ese orden.
+    """
+    nombres = hojas(ruta, tipos, directorio)
+    if not isinstance(hoja, int):
+        if hoja not in nombres:
+            raise KeyError(f"Hoja no encontrada: {hoja} (hojas: {', '.join(nombres)})")
+        hoja = nombres.index(hoja)
+    elif not -len(nombres) <= hoja < len(nombres):
+        raise IndexError(f"Hoja fuera de rango: {hoja} (el libro tiene {len(nombres)})")
+    archivo = os.path.join(directorio_cache(ruta, tipos, directorio), f'{hoja % len(nombres)}.arrow')
+    resultado = pa.ipc.open_file(pa.memory_map(archivo)).read_all()
+    return resultado if columnas is None else resultado.select(list(columnas))
+
+
+def cargar(ruta, hoja=0, columnas=None, tipos=None, directorio=None):
+    """Equivalente a ``pd.read_excel(ruta, sheet_name=hoja)[columnas]`` desde la caché."""
+    return tabla(ruta, hoja, columnas, tipos, directorio).to_pandas()
+
+
+# ============================================================================
+# Interfaz de línea de comandos
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('libros', nargs='+', metavar='libro.xlsx')
+    parser.add_argument('--directorio', help=f'Directorio de la caché (por defecto, {DIRECTORIO}/ junto a cada libro)')
+    args = parser.parse_args(argv)
+
+    for libro in args.libros:
+        inicio = time.perf_counter()
+        destino = convertir(libro, directorio=args.directorio)
+        convertido = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for nombre in hojas(libro, directorio=args.directorio):
+            cargar(libro, nombre, directorio=args.directorio)
+        leido = time.perf_counter() - inicio
+        print(f"✓ {libro} -> {destino} ({convertido:.2f} s; lectura de todas las hojas: {leido * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Limpieza de CovidDiagnosis (Practica_1.ipynb) como pipeline reutilizable.
+
+Reproduce los pasos del notebook sin recorrer las filas en Python:
+
+* ``Gender``: moda para los vacíos, minúsculas, solo letras y unificación
+  de variantes (``'Masculinoooo'``, ``'masculino.....//'``...) en
+  ``Femenino``/``Masculino``.
+* ``Headache``: unificación de ``SI``/``SI ``/``YES``/``OUI`` y ``NO``/``NOP``
+  (los vacíos se conservan).
+* ``Age``: mediana para los vacíos.
+
+Las columnas de texto se normalizan sobre sus valores únicos
+(``pd.factorize``): las operaciones ``.str`` y las tablas de equivalencias
+se aplican una vez por valor distinto y el resultado se expande con los
+códigos, así que el coste no depende del número de filas sino del de
+variantes. El resultado son columnas categóricas.
+
+Para archivos grandes, ``limpiar_archivo`` procesa por lotes con memoria
+acotada en dos pasadas: la primera acumula en una sola lectura los conteos
+de cada columna (de ellos salen a la vez la mediana, la moda y las
+categorías), la segunda limpia y escribe Parquet lote a lote. Los conteos
+ocupan un valor por cada valor distinto (edades, variantes de texto), no
+por fila.
+
+Uso:
+    from limpieza import limpiar
+    df = limpiar(cache_excel.cargar('CovidDiagnosis.xlsx'))
+
+    python limpieza.py CovidDiagnosis.xlsx CovidDiagnosis_LIMPIO.parquet
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import cache_excel
+
+TAMANO_LOTE = 1_000_000      # filas por lote en limpiar_archivo
+
+
+# ============================================================================
+# Normalización de texto (sobre valores únicos)
+# ============================================================================
+GENEROS = {
+    'femenino': 'Femenino',
+    'masculino': 'Masculino',
+    'masculinoooo': 'Masculino',
+}
+
+CEFALEA = {
+    'SI': 'SI',
+    'YES': 'SI',
+    'OUI': 'SI',
+    'NO': 'NO',
+    'NOP': 'NO',
+}
+
+
+def _normalizar_genero(valores):
+    limpios = valores.str.lower().str.replace(r'[^a-z]', '', regex=True)
+    return limpios.map(GENEROS).fillna(limpios.str.capitalize())
+
+
+def _normalizar_cefalea(valores):
+    limpios = valores.str.strip().str.upper()
+    return limpios.map(CEFALEA).fillna(limpios)
+
+
+# Columna -> función que recibe una Serie 'string' de valores únicos
+NORMALIZADORES = {
+    'Gender': _normalizar_genero,
+    'Headache': _normalizar_cefalea,
+}
+
+# Columna -> estadístico con el que se rellenan los vacíos
+IMPUTACION = {
+    'Age': 'mediana',
+    'Gender': 'moda',
+}
+
+
+def _codigos(serie, normalizador, memoria):
+    """(códigos, valores normalizados de cada código); -1 marca los vacíos.
+
+    ``memoria`` guarda el valor normalizado de cada original ya visto, así
+    los lotes siguientes solo normalizan las variantes nuevas.
+    """
+    codigos, unicos = pd.factorize(serie)
+    nuevos = [u for u in unicos if u not in memoria]
+    if nuevos:
+        normalizados = normalizador(pd.Series(nuevos).astype('string'))
+        memoria.update(zip(nuevos, normalizados))
+    return codigos, [memoria[u] for u in unicos]
+
+
+# ============================================================================
+# Estadísticos (una pasada, acumulable por lotes)
+# ============================================================================
+def _mediana(conteos):
+    """Mediana de los valores de ``conteos`` (igual que ``Series.median``)."""
+    conteos = conteos.sort_index()
+    acumulado = conteos.cumsum().to_numpy()
+    total = acumulado[-1]
+    valores = conteos.index.to_numpy(dtype=float)
+    bajo = valores[np.searchsorted(acumulado, (total - 1) // 2, side='right')]
+    alto = valores[np.searchsorted(acumulado, total // 2, side='right')]
+    return (bajo + alto) / 2
+
+
+def _moda(conteos):
+    """Valor más frecuente; ante un empate, el menor (igual que ``Series.mode()[0]``)."""
+    conteos = conteos.sort_index()
+    return conteos.index[conteos.to_numpy().argmax()]
+
+
+class Parametros:
+    """Conteos acumulados y, a partir de ellos, los valores de la limpieza."""
+
+    def __init__(self):
+        self.conteos = {}
+        self.memoria = {c: {} for c in NORMALIZADORES}
+
+    def acumular(self, df):
+        """Suma a los conteos los de ``df`` (un lote o el conjunto entero)."""
+        for columna in NORMALIZADORES.keys() | IMPUTACION.keys():
+            if columna not in df:
+                continue
+            if columna in NORMALIZADORES:
+                codigos, valores = _codigos(df[columna], NORMALIZADORES[columna],
+                                            self.memoria[columna])
+                frecuencias = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+                conteos = pd.Series(frecuencias, index=valores).groupby(level=0).sum()
+            else:
+                conteos = df[columna].value_counts()
+            previos = self.conteos.get(columna)
+            self.conteos[columna] = conteos if previos is None else previos.add(conteos, fill_value=0)
+        return self
+
+    def relleno(self, columna):
+        """Valor con el que se rellenan los vacíos de ``columna``."""
+        conteos = self.conteos.get(columna)
+        if conteos is None or not conteos.sum():
+            return None
+        return _mediana(conteos) if IMPUTACION[columna] == 'mediana' else _moda(conteos)
+
+    def categorias(self, columna):
+        """Tipo categórico de ``columna``: todos sus valores normalizados, ordenados."""
+        return pd.CategoricalDtype(sorted(self.conteos.get(columna, pd.Series()).index))
+
+
+# ============================================================================
+# Limpieza
+# ============================================================================
+def limpiar(df, parametros=None):
+    """Copia limpia de ``df``.
+
+    ``parametros`` (un ``Parametros`` ya acumulado) fija los rellenos y las
+    categorías; por defecto se calculan del propio ``df``.
+    """
+    if parametros is None:
+        parametros = Parametros().acumular(df)
+    df = df.copy()
+    for columna, normalizador in NORMALIZADORES.items():
+        if columna not in df:
+            continue
+        tipo = parametros.categorias(columna)
+        codigos, valores = _codigos(df[columna], normalizador, parametros.memoria[columna])
+        # el código -1 (vacío) toma el último elemento, -1: sigue vacío
+        tabla = np.append(tipo.categories.get_indexer(valores), -1)
+        df[columna] = pd.Categorical.from_codes(tabla[codigos], dtype=tipo)
+    for columna in IMPUTACION:
+        relleno = parametros.relleno(columna)
+        if columna in df and relleno is not None:
+            df[columna] = df[columna].fillna(relleno)
+    return df
+
+
+def lotes(ruta, tamano=TAMANO_LOTE):
+    """DataFrames de como mucho ``tamano`` filas leídos de ``ruta``.
+
+    Admite Parquet, Arrow IPC/Feather, CSV y Excel (este último a través de
+    la caché de ``cache_excel``). Los CSV se leen con los tipos de
+    ``cache_excel.TIPOS`` y el resto de columnas como texto, igual que las
+    del Excel.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.parquet':
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tamano):
+            yield lote.to_pandas()
+    elif extension == '.csv':
+        # Tipos fijos: inferidos por lote, una columna mixta (Temperature)
+        # sale numérica en unos lotes y de texto en otros
+        columnas = pd.read_csv(ruta, nrows=0).columns
+        tipos = {c: cache_excel.TIPOS.get(c, 'string') for c in columnas}
+        yield from pd.read_csv(ruta, chunksize=tamano, dtype=tipos)
+    else:
+        if extension in ('.arrow', '.feather'):
+            tabla = pa.ipc.open_file(pa.memory_map(ruta)).read_all()
+        elif extension in ('.xlsx', '.xls'):
+            tabla = cache_excel.tabla(ruta)
+        else:
+            raise ValueError(f"Formato no soportado: {ruta}")
+        for lote in tabla.to_batches(max_chunksize=tamano):
+            yield lote.to_pandas()
+
+
+def limpiar_archivo(origen, destino, tamano=TAMANO_LOTE):
+    """Limpia ``origen`` por lotes y escribe el resultado en ``destino`` (Parquet).
+
+    Devuelve los ``Parametros`` usados. El Parquet se escribe en un
+    temporal que solo reemplaza a ``destino`` al terminar.
+    """
+    parametros = Parametros()
+    for lote in lotes(origen, tamano):
+        parametros.acumular(lote)
+
+    directorio = os.path.dirname(os.path.abspath(destino))
+    tmp = cache_excel.nombre_temporal(directorio, '.parquet')
+    open(tmp, 'xb').close()
+    escritor = esquema = None
+    try:
+        for lote in lotes(origen, tamano):
+            limpio = limpiar(lote, parametros)
+            # todos los lotes con el esquema del primero (CSV puede inferir otro)
+            tabla = pa.Table.from_pandas(limpio, schema=esquema, preserve_index=False)
+            if escritor is None:
+                esquema = tabla.schema
+                escritor = pq.ParquetWriter(tmp, esquema)
+            escritor.write_table(tabla)
+        if escritor is not None:
+            escritor.close()
+        os.replace(tmp, destino)
+    except BaseException:
+        if escritor is not None:
+            escritor.close()
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return parametros
+
+
+# ============================================================================
+# Interfaz de línea de comandos
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('origen', help='Datos sin limpiar (.xlsx, .parquet, .arrow, .csv)')
+    parser.add_argument('destino', help='Parquet de salida')
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE,
+                        help=f'Filas por lote (por defecto, {TAMANO_LOTE})')
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    parametros = limpiar_archivo(args.origen, args.destino, args.lote)
+    for columna in IMPUTACION:
+        print(f"  {columna}: vacíos -> {parametros.relleno(columna)}")
+    for columna in NORMALIZADORES:
+        if columna in parametros.conteos:
+            print(f"  {columna}: {', '.join(parametros.categorias(columna).categories)}")
+    print(f"✓ {args.destino} ({time.perf_counter() - inicio:.2f} s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
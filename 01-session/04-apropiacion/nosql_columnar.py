@@ -0,0 +1,247 @@
+"""
+Simulación y perfil de la colección NoSQL heterogénea a gran escala.
+
+En ``notebook_promt_ejecucion.ipynb`` (sección 3.2) cada documento es un
+diccionario y cada campo opcional se decide con un ``random.random()``;
+después se cuentan los campos extendiendo una lista con todas las claves.
+Eso sirve para 200 documentos, pero no para millones.
+
+Aquí la colección se guarda por columnas, como en Arrow: un array de
+valores por campo y, para cada campo opcional, un mapa de validez de un bit
+por documento (``np.packbits``, orden de bits 'little'). La presencia de
+cada campo se sortea para todos los documentos a la vez con un
+``np.random.Generator`` con semilla, por bloques de ``LOTE`` documentos
+para acotar la memoria. Los campos derivados del id (``nombre``, ``email``)
+no se guardan: se forman al materializar los documentos.
+
+El perfil sale de los mapas de bits sin construir ningún documento:
+
+* ``frecuencias``: documentos que tienen cada campo (popcount del mapa);
+* ``coocurrencia``: documentos que tienen a la vez cada par de campos
+  (popcount del AND de los mapas);
+* ``esquemas``: documentos por combinación de campos presentes.
+
+``escribir_jsonl`` vuelca los documentos, en orden, por bloques.
+
+Uso:
+    from nosql_columnar import generar, frecuencias
+    coleccion = generar(10_000_000)
+    frecuencias(coleccion)          # mismo dato que el Counter del notebook
+
+    python nosql_columnar.py 10000000 --jsonl documentos.jsonl
+"""
+
+import argparse
+import functools
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+SEMILLA = 42
+LOTE = 1 << 20                   # documentos por bloque (múltiplo de 8)
+
+OBLIGATORIOS = ('id', 'nombre', 'edad')
+# Campo opcional -> probabilidad de que un documento lo tenga (sección 3.2)
+PROBABILIDADES = {
+    'email': 0.5,
+    'telefono': 0.3,
+    'direccion': 0.2,
+}
+CAMPOS = OBLIGATORIOS + tuple(PROBABILIDADES)
+
+# Campo -> (fragmento JSON, columnas que lo rellenan); 'i' es la posición del
+# documento. Los valores son números o texto ASCII generado, así que no hace
+# falta escaparlos.
+_PLANTILLAS = {
+    'id': ('"id": {}', ('id',)),
+    'nombre': ('"nombre": "Usuario_{}"', ('i',)),
+    'edad': ('"edad": {}', ('edad',)),
+    'email': ('"email": "usuario{}@ejemplo.com"', ('i',)),
+    'telefono': ('"telefono": "300{}"', ('telefono',)),
+    'direccion': ('"direccion": "Calle {} #{}-A"', ('calle', 'numero')),
+}
+
+
+@dataclass
+class Coleccion:
+    """Documentos por columnas.
+
+    ``valores``: columna -> array con un valor por documento (también en los
+    que no tienen el campo, como los huecos de Arrow). ``validez``: campo
+    opcional -> mapa de bits empaquetado.
+    """
+    total: int
+    valores: dict
+    validez: dict
+
+    def __len__(self):
+        return self.total
+
+    def presentes(self, campo, inicio=0, fin=None):
+        """Máscara booleana de los documentos ``[inicio, fin)`` que tienen ``campo``."""
+        fin = self.total if fin is None else min(fin, self.total)
+        if campo not in self.validez:
+            return np.full(max(fin - inicio, 0), campo in OBLIGATORIOS)
+        # Se desempaqueta desde el byte que contiene a ``inicio`` y se
+        # descartan los bits anteriores
+        desfase = inicio % 8
+        bytes_ = self.validez[campo][inicio // 8:-(-fin // 8)]
+        bits = np.unpackbits(bytes_, count=max(fin - inicio + desfase, 0), bitorder='little')
+        return bits[desfase:].astype(bool)
+
+
+def _validar_lote(lote):
+    """Los bloques deben empezar en un byte de los mapas de bits."""
+    if lote <= 0 or lote % 8:
+        raise ValueError(f"El lote debe ser un múltiplo de 8 positivo: {lote}")
+
+
+# ============================================================================
+# Generación
+# ============================================================================
+def generar(total, probabilidades=None, semilla=SEMILLA, lote=LOTE):
+    """Colección de ``total`` documentos con los campos opcionales sorteados.
+
+    ``probabilidades`` sustituye a ``PROBABILIDADES``; los campos opcionales
+    que no aparezcan en ella no estarán en ningún documento. ``lote`` debe
+    ser múltiplo de 8 (cada bloque llena bytes enteros de los mapas).
+    """
+    _validar_lote(lote)
+    probabilidades = PROBABILIDADES if probabilidades is None else probabilidades
+    rng = np.random.default_rng(semilla)
+    valores = {
+        'edad': rng.integers(18, 65, size=total, dtype=np.int8),
+        'telefono': rng.integers(1_000_000, 10_000_000, size=total, dtype=np.int32),
+        'calle': rng.integers(1, 101, size=total, dtype=np.uint8),
+        'numero': rng.integers(1, 100, size=total, dtype=np.uint8),
+    }
+    validez = {campo: np.empty(-(-total // 8), dtype=np.uint8) for campo in probabilidades}
+    for inicio in range(0, total, lote):
+        n = min(lote, total - inicio)
+        for campo, p in probabilidades.items():
+            mascara = rng.random(n, dtype=np.float32) < p
+            validez[campo][inicio // 8:inicio // 8 + -(-n // 8)] = np.packbits(mascara, bitorder='little')
+    return Coleccion(total, valores, validez)
+
+
+def documentos(coleccion, inicio=0, fin=None):
+    """Documentos ``[inicio, fin)`` como diccionarios (para mostrar unos pocos)."""
+    fin = len(coleccion) if fin is None else min(fin, len(coleccion))
+    presencia = {c: coleccion.presentes(c, inicio, fin) for c in PROBABILIDADES}
+    v = {k: a[inicio:fin].tolist() for k, a in coleccion.valores.items()}
+    resultado = []
+    for j, i in enumerate(range(inicio, fin)):
+        doc = {'id': i + 1, 'nombre': f"Usuario_{i}", 'edad': v['edad'][j]}
+        if presencia['email'][j]:
+            doc['email'] = f"usuario{i}@ejemplo.com"
+        if presencia['telefono'][j]:
+            doc['telefono'] = f"300{v['telefono'][j]}"
+        if presencia['direccion'][j]:
+            doc['direccion'] = f"Calle {v['calle'][j]} #{v['numero'][j]}-A"
+        resultado.append(doc)
+    return resultado
+
+
+# ============================================================================
+# Perfil del esquema
+# ============================================================================
+def _conteo(coleccion, *campos):
+    """Documentos que tienen todos los ``campos`` (popcount del AND de sus mapas)."""
+    if any(c not in OBLIGATORIOS and c not in coleccion.validez for c in campos):
+        return 0
+    mapas = [coleccion.validez[c] for c in campos if c in coleccion.validez]
+    if not mapas:
+        return len(coleccion)
+    return int(np.bitwise_count(functools.reduce(np.bitwise_and, mapas)).sum())
+
+
+def frecuencias(coleccion):
+    """Documentos que tienen cada campo."""
+    return pd.Series({c: _conteo(coleccion, c) for c in CAMPOS}, name='documentos')
+
+
+def coocurrencia(coleccion):
+    """Matriz campo x campo con los documentos que tienen ambos campos."""
+    return pd.DataFrame([[_conteo(coleccion, a, b) for b in CAMPOS] for a in CAMPOS],
+                        index=CAMPOS, columns=CAMPOS)
+
+
+def _codigos(coleccion, inicio, fin):
+    """Código de esquema de cada documento: bit k = tiene el k-ésimo campo opcional."""
+    codigos = np.zeros(fin - inicio, dtype=np.int64)
+    for k, campo in enumerate(coleccion.validez):
+        codigos |= coleccion.presentes(campo, inicio, fin).astype(np.int64) << k
+    return codigos
+
+
+def esquemas(coleccion, lote=LOTE):
+    """Documentos por combinación de campos presentes, de la más a la menos frecuente."""
+    opcionales = list(coleccion.validez)
+    conteos = np.zeros(1 << len(opcionales), dtype=np.int64)
+    for inicio in range(0, len(coleccion), lote):
+        fin = min(inicio + lote, len(coleccion))
+        conteos += np.bincount(_codigos(coleccion, inicio, fin), minlength=len(conteos))
+    nombres = [', '.join(OBLIGATORIOS + tuple(c for k, c in enumerate(opcionales) if codigo >> k & 1))
+               for codigo in range(len(conteos))]
+    serie = pd.Series(conteos, index=nombres, name='documentos')
+    return serie[serie > 0].sort_values(ascending=False, kind='stable')
+
+
+# ============================================================================
+# Exportación
+# ============================================================================
+def escribir_jsonl(coleccion, ruta, lote=LOTE):
+    """Escribe un documento JSON por línea en ``ruta``, en orden y por bloques.
+
+    Dentro de cada bloque los documentos se agrupan por esquema y cada grupo
+    se formatea con una sola plantilla.
+    """
+    opcionales = list(coleccion.validez)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for inicio in range(0, len(coleccion), lote):
+            fin = min(inicio + lote, len(coleccion))
+            codigos = _codigos(coleccion, inicio, fin)
+            lineas = np.empty(fin - inicio, dtype=object)
+            for codigo in np.unique(codigos):
+                posiciones = np.flatnonzero(codigos == codigo)
+                campos = OBLIGATORIOS + tuple(c for k, c in enumerate(opcionales) if codigo >> k & 1)
+                plantilla = '{{' + ', '.join(_PLANTILLAS[c][0] for c in campos) + '}}'
+                filas = posiciones + inicio
+                disponibles = {'i': filas, 'id': filas + 1, **coleccion.valores}
+                columnas = [(disponibles[n] if n in ('i', 'id') else disponibles[n][filas]).tolist()
+                            for c in campos for n in _PLANTILLAS[c][1]]
+                lineas[posiciones] = list(map(plantilla.format, *columnas))
+            f.write('\n'.join(lineas))
+            f.write('\n')
+
+
+# ============================================================================
+# Interfaz de línea de comandos
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('documentos', type=int, help='Número de documentos a simular')
+    parser.add_argument('--semilla', type=int, default=SEMILLA)
+    parser.add_argument('--jsonl', metavar='RUTA', help='Escribir también los documentos en JSONL')
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    coleccion = generar(args.documentos, semilla=args.semilla)
+    print(f"✓ {args.documentos} documentos generados ({time.perf_counter() - inicio:.2f} s)")
+    inicio = time.perf_counter()
+    print(frecuencias(coleccion).to_string())
+    print(coocurrencia(coleccion).to_string())
+    print(esquemas(coleccion).to_string())
+    print(f"✓ Perfil calculado ({time.perf_counter() - inicio:.2f} s)")
+    if args.jsonl:
+        inicio = time.perf_counter()
+        escribir_jsonl(coleccion, args.jsonl)
+        print(f"✓ {args.jsonl} ({time.perf_counter() - inicio:.2f} s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
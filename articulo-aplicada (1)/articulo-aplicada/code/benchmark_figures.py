@@ -0,0 +1,192 @@
+"""
+Benchmark de la generación de figuras.
+
+Ejecuta cada figura registrada N veces con el backend Agg, cada una en un
+proceso nuevo para que el pico de memoria (RSS) sea solo suyo, y mide por
+separado las fases: construcción (datos + artistas), layout
+(``tight_layout``), caja ajustada y exportación de cada formato. Una
+repetición adicional bajo ``tracemalloc`` mide el pico de memoria de Python.
+Los archivos se escriben en un directorio temporal, nunca en ``graphics/``.
+
+El resultado se guarda en JSON y puede compararse con una línea base: si
+alguna figura empeora más del umbral, el script termina con código 1.
+
+Uso:
+    python benchmark_figures.py -n 5 -o bench.json
+    python benchmark_figures.py --baseline bench_base.json --threshold 0.2
+    python benchmark_figures.py --save-baseline bench_base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
+import generate_figures as gf
+import datasets
+import figexport
+
+# Métricas que se comparan con la línea base
+METRICAS = ('total', 'rss_pico_mb', 'tracemalloc_pico_mb')
+
+
+def _medir_una_vez(figura, formatos, directorio):
+    """Tiempos (s) de cada fase de una ejecución de la figura."""
+    t0 = time.perf_counter()
+    fig = figura.funcion(*[datasets.cargar(d) for d in figura.datos])
+    t1 = time.perf_counter()
+    fig.tight_layout()
+    t2 = time.perf_counter()
+    caja = figexport.caja_ajustada(fig)
+    t3 = time.perf_counter()
+    exportar = {}
+    for formato in formatos:
+        inicio = time.perf_counter()
+        figexport.escribir_atomico(fig, os.path.join(directorio, f'{figura.salida}.{formato}'),
+                                   formato, caja)
+        exportar[formato] = time.perf_counter() - inicio
+    gf.plt.close(fig)
+    return {'build': t1 - t0, 'layout': t2 - t1, 'bbox': t3 - t2, 'export': exportar,
+            'total': time.perf_counter() - t0}
+
+
+def medir_figura(nombre, repeticiones, formatos, directorios_datos):
+    """Mide una figura en el proceso actual (pensado para un proceso nuevo)."""
+    import resource
+
+    datasets.configurar(directorios_datos)
+    gf._cargar_matplotlib()
+    figura = gf.REGISTRO[nombre]
+    with tempfile.TemporaryDirectory() as directorio:
+        corridas = [_medir_una_vez(figura, formatos, directorio) for _ in range(repeticiones)]
+
+        tracemalloc.start()
+        _medir_una_vez(figura, formatos, directorio)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    mediana = lambda clave: statistics.median(c[clave] for c in corridas)
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    escala = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'build': mediana('build'),
+        'layout': mediana('layout'),
+        'bbox': mediana('bbox'),
+        'export': {f: statistics.median(c['export'][f] for c in corridas) for f in formatos},
+        'total': mediana('total'),
+        'total_min': min(c['total'] for c in corridas),
+        'rss_pico_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * escala / 2**20,
+        'tracemalloc_pico_mb': pico / 2**20,
+    }
+
+
+def ejecutar(figuras, repeticiones=3, formatos=gf.FORMATOS):
+    """Resultados de todas las figuras, cada una en un proceso recién creado."""
+    resultados = {}
+    # max_tasks_per_child=1: un proceso limpio por figura (RSS y cachés propios)
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for figura in figuras:
+            resultados[figura.nombre] = pool.submit(
+                medir_figura, figura.nombre, repeticiones, formatos,
+                datasets.directorios()).result()
+            r = resultados[figura.nombre]
+            exportes = '  '.join(f'{f}={t * 1000:.0f}' for f, t in r['export'].items())
+            print(f"{figura.nombre:<34} total={r['total'] * 1000:7.0f} ms  "
+                  f"build={r['build'] * 1000:.0f}  layout={r['layout'] * 1000:.0f}  "
+                  f"bbox={r['bbox'] * 1000:.0f}  {exportes}  "
+                  f"rss={r['rss_pico_mb']:.0f} MB  py={r['tracemalloc_pico_mb']:.1f} MB")
+    return {
+        'meta': {
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'matplotlib': metadata.version('matplotlib'),
+            'plataforma': platform.platform(),
+            'repeticiones': repeticiones,
+            'formatos': list(formatos),
+        },
+        'figuras': resultados,
+    }
+
+
+def comparar(actual, base, umbral, min_segundos):
+    """Lista de regresiones (texto) de ``actual`` respecto a ``base``.
+
+    Los tiempos solo cuentan como regresión si además superan ``min_segundos``
+    de diferencia absoluta, para no reaccionar al ruido de figuras rápidas.
+    """
+    regresiones = []
+    for nombre, r in actual['figuras'].items():
+        b = base.get('figuras', {}).get(nombre)
+        if b is None:
+            continue
+        for metrica in METRICAS:
+            if metrica not in b or not b[metrica]:
+                continue
+            cambio = (r[metrica] - b[metrica]) / b[metrica]
+            absoluto = r[metrica] - b[metrica]
+            if cambio > umbral and (metrica != 'total' or absoluto > min_segundos):
+                regresiones.append(f"{nombre}: {metrica} {b[metrica]:.3f} -> "
+                                   f"{r[metrica]:.3f} (+{cambio:.0%})")
+    return regresiones
+
+
+def _guardar(datos, ruta):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('patrones', nargs='*', metavar='nombre|glob',
+                        help='Figuras a medir (por defecto, todas)')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='Repeticiones por figura (se reporta la mediana)')
+    parser.add_argument('--formats', type=gf._lista_formatos, default=gf.FORMATOS,
+                        metavar='EXT[,EXT...]')
+    parser.add_argument('-o', '--output', help='Guardar los resultados en este JSON')
+    parser.add_argument('--baseline', help='JSON de referencia con el que comparar')
+    parser.add_argument('--save-baseline', metavar='RUTA',
+                        help='Guardar los resultados como nueva línea base')
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help='Empeoramiento relativo tolerado (por defecto 0.20 = 20%%)')
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help='Diferencia mínima en segundos para contar un tiempo como '
+                             'regresión (por defecto 0.05)')
+    args = parser.parse_args(argv)
+
+    figuras = gf.seleccionar(args.patrones)
+    if not figuras:
+        print(f"No hay figuras que coincidan con: {' '.join(args.patrones)}", file=sys.stderr)
+        return 2
+
+    resultados = ejecutar(figuras, args.repeat, args.formats)
+    total = sum(r['total'] for r in resultados['figuras'].values())
+    print(f"\nTotal secuencial: {total:.2f} s")
+    if args.output:
+        _guardar(resultados, args.output)
+    if args.save_baseline:
+        _guardar(resultados, args.save_baseline)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            base = json.load(f)
+        regresiones = comparar(resultados, base, args.threshold, args.min_delta)
+        if regresiones:
+            print(f"\n❌ {len(regresiones)} regresiones respecto a {args.baseline}:")
+            for r in regresiones:
+                print(f"  {r}")
+            return 1
+        print(f"\n✅ Sin regresiones respecto a {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
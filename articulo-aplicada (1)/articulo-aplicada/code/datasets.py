@@ -0,0 +1,205 @@
+"""
+Capa de datos de las figuras.
+
+Cada figura declara por nombre los conjuntos de datos que usa; aquí se
+resuelven a ``data/<nombre>.parquet|csv|json`` y se cargan como un
+diccionario ``{columna: valores}``: las columnas numéricas son arrays de
+NumPy de solo lectura y las de texto, tuplas. Los directorios configurados
+con ``configurar`` (p. ej. métricas exportadas de producción) tienen
+prioridad sobre los datos incluidos en el repositorio.
+
+Un nombre terminado en ``?`` declara un conjunto opcional: si no hay archivo,
+``cargar`` devuelve ``None`` en lugar de fallar.
+
+Los datos ya leídos se guardan en memoria por proceso, indexados por ruta,
+fecha de modificación y hash del contenido: varias figuras que comparten
+un conjunto lo leen una sola vez, y un archivo modificado se vuelve a leer.
+"""
+
+import csv
+import hashlib
+import json
+import os
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+EXTENSIONES = ('parquet', 'csv', 'json')
+OPCIONAL = '?'
+
+_adicionales = []
+_memoria = {}   # ruta -> (mtime_ns, tamaño, hash, datos)
+
+
+def configurar(directorios=()):
+    """Antepone ``directorios`` a los datos incluidos al buscar conjuntos."""
+    incluidos = os.path.normpath(DIRECTORIO)
+    _adicionales[:] = [d for d in map(os.path.abspath, directorios) if d != incluidos]
+    _memoria.clear()
+
+
+def directorios():
+    """Directorios de búsqueda, en orden de prioridad."""
+    return _adicionales + [os.path.normpath(DIRECTORIO)]
+
+
+def ruta(nombre):
+    """Primer archivo ``<nombre>.<ext>`` encontrado en los directorios de datos.
+
+    Para un conjunto opcional inexistente devuelve ``None``.
+    """
+    opcional = nombre.endswith(OPCIONAL)
+    nombre = nombre.rstrip(OPCIONAL)
+    for directorio in directorios():
+        for ext in EXTENSIONES:
+            candidato = os.path.normpath(os.path.join(directorio, f'{nombre}.{ext}'))
+            if os.path.exists(candidato):
+                return candidato
+    if opcional:
+        return None
+    raise FileNotFoundError(
+        f"No se encontró el conjunto de datos '{nombre}' "
+        f"({'|'.join(EXTENSIONES)}) en: {', '.join(directorios())}")
+
+
+def _hash_archivo(ruta_archivo):
+    h = hashlib.sha256()
+    with open(ruta_archivo, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _entrada(ruta_archivo):
+    """Entrada de la memoria vigente para el archivo, recalculando el hash si cambió."""
+    st = os.stat(ruta_archivo)
+    previa = _memoria.get(ruta_archivo)
+    if previa and previa[:2] == (st.st_mtime_ns, st.st_size):
+        return previa
+    digest = _hash_archivo(ruta_archivo)
+    if previa and previa[2] == digest:
+        # Solo cambió la fecha (p. ej. un checkout): se reutilizan los datos
+        entrada = (st.st_mtime_ns, st.st_size, digest, previa[3])
+    else:
+        entrada = (st.st_mtime_ns, st.st_size, digest, None)
+    _memoria[ruta_archivo] = entrada
+    return entrada
+
+
+def huella(nombre):
+    """Hash del contenido del archivo que respalda el conjunto ``nombre``."""
+    ruta_archivo = ruta(nombre)
+    if ruta_archivo is None:
+        return nombre, None
+    return os.path.basename(ruta_archivo), _entrada(ruta_archivo)[2]
+
+
+def cargar(nombre):
+    """Datos del conjunto ``nombre``, leídos como mucho una vez por versión del archivo."""
+    ruta_archivo = ruta(nombre)
+    if ruta_archivo is None:
+        return None
+    mtime, tamano, digest, datos = _entrada(ruta_archivo)
+    if datos is None:
+        datos = _LECTORES[os.path.splitext(ruta_archivo)[1].lstrip('.')](ruta_archivo)
+        _memoria[ruta_archivo] = (mtime, tamano, digest, datos)
+    return datos
+
+
+# ============================================================================
+# Lectores por formato
+# ============================================================================
+def _columna(valores):
+    """Lista de valores -> array numérico de solo lectura o tupla de textos."""
+    import numpy as np
+
+    if valores and all(isinstance(v, (int, float)) and not isinstance(v, bool)
+                       for v in valores):
+        arr = np.asarray(valores)
+        arr.flags.writeable = False
+        return arr
+    return tuple(valores)
+
+
+def _texto_a_numero(valor):
+    try:
+        return int(valor)
+    except ValueError:
+        try:
+            return float(valor)
+        except ValueError:
+            return valor
+
+
+def _columnas_numericas(ruta_archivo, indices):
+    """Columnas ``indices`` del CSV leídas en una sola pasada con ``np.loadtxt``.
+
+    Devuelve una lista de arrays de solo lectura (int64 si todos los valores
+    son enteros exactos, float64 si no), o ``None`` si algún valor no es
+    numérico o falta en alguna fila.
+    """
+    import numpy as np
+
+    try:
+        tabla = np.loadtxt(ruta_archivo, dtype=np.float64, delimiter=',', skiprows=1,
+                           usecols=indices, comments=None, quotechar='"',
+                           encoding='utf-8', ndmin=2)
+    except ValueError:
+        return None
+    columnas = []
+    for valores in tabla.T:
+        exactos = (np.isfinite(valores).all() and np.array_equal(np.trunc(valores), valores)
+                   and np.abs(valores).max(initial=0) < 2 ** 63)
+        arr = valores.astype(np.int64) if exactos else valores.copy()
+        arr.flags.writeable = False
+        columnas.append(arr)
+    return columnas
+
+
+def _leer_csv(ruta_archivo):
+    with open(ruta_archivo, newline='', encoding='utf-8') as f:
+        lector = csv.reader(f)
+        columnas = next(lector, [])
+        primera = next(lector, None)
+        if primera is None:
+            return {}
+    # Las columnas que en la primera fila son numéricas se convierten en C,
+    # todas en una sola lectura; con series largas, convertir cada celda en
+    # Python domina el tiempo de la figura. Si alguna resulta no serlo más
+    # abajo, todo el archivo se lee celda a celda.
+    indices = [i for i, v in enumerate(primera[:len(columnas)])
+               if not isinstance(_texto_a_numero(v), str)]
+    numericas = _columnas_numericas(ruta_archivo, indices) if indices else []
+    if numericas is None:
+        indices, numericas = [], []
+    datos = {columnas[i]: arr for i, arr in zip(indices, numericas)}
+    texto = [c for c in columnas if c not in datos]
+    if texto:
+        with open(ruta_archivo, newline='', encoding='utf-8') as f:
+            filas = list(csv.DictReader(f))
+        for c in texto:
+            datos[c] = _columna([_texto_a_numero(fila[c]) for fila in filas])
+    return {c: datos[c] for c in columnas}
+
+
+def _convertir_json(valor):
+    if isinstance(valor, dict):
+        return {k: _convertir_json(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return _columna(valor)
+    return valor
+
+
+def _leer_json(ruta_archivo):
+    with open(ruta_archivo, encoding='utf-8') as f:
+        return _convertir_json(json.load(f))
+
+
+def _leer_parquet(ruta_archivo):
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError('Leer datos .parquet requiere pandas y pyarrow') from e
+    df = pd.read_parquet(ruta_archivo)
+    return {c: _columna(df[c].tolist()) for c in df.columns}
+
+
+_LECTORES = {'csv': _leer_csv, 'json': _leer_json, 'parquet': _leer_parquet}
@@ -0,0 +1,111 @@
+"""
+Reducción de series largas para las figuras de líneas.
+
+Una serie con cientos de miles de puntos dibujada como vector hace que el
+PDF pese megas y que xelatex y los visores vayan lentos. Por encima de un
+presupuesto de puntos, ``trazar`` y ``banda`` reducen la serie conservando
+su forma y marcan el artista como ``rasterized=True``: el resto de la figura
+(ejes, textos, leyenda) sigue siendo vectorial y el tamaño del archivo queda
+acotado sea cual sea la entrada. Las series cortas se dibujan sin cambios.
+
+Métodos:
+
+* ``'lttb'`` (Largest-Triangle-Three-Buckets): elige en cada cubeta el punto
+  que forma el triángulo más grande con el punto anterior y la media de la
+  cubeta siguiente; conserva picos y tendencias con pocos puntos.
+* ``'minmax'``: mínimo y máximo de cada cubeta; conserva la envolvente
+  exacta, útil para series muy ruidosas.
+"""
+
+import numpy as np
+
+PRESUPUESTO = 2000     # puntos por serie a partir de los cuales se reduce
+METODOS = ('lttb', 'minmax')
+
+
+def lttb(x, y, n):
+    """Índices de los ``n`` puntos elegidos por LTTB (incluye el primero y el último)."""
+    total = len(x)
+    if n >= total or n < 3:
+        return np.arange(total)
+    # n - 2 cubetas entre el primer y el último punto
+    bordes = np.linspace(1, total - 1, n - 1).astype(np.int64)
+    siguientes = np.append(bordes[2:], total)
+    indices = np.empty(n, dtype=np.int64)
+    indices[0], indices[-1] = 0, total - 1
+    a = 0
+    for i in range(n - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        mx = x[fin:siguientes[i]].mean()
+        my = y[fin:siguientes[i]].mean()
+        area = np.abs((x[a] - mx) * (y[inicio:fin] - y[a])
+                      - (x[a] - x[inicio:fin]) * (my - y[a]))
+        a = inicio + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def _cubetas(valores, n):
+    """``valores`` repartidos en ``n`` cubetas de igual tamaño (rellenas con NaN)."""
+    tamano = -(-len(valores) // n)
+    relleno = np.full(n * tamano, np.nan)
+    relleno[:len(valores)] = valores
+    return relleno.reshape(n, tamano), tamano
+
+
+def minmax(y, n):
+    """Índices del mínimo y el máximo de cada una de ``n // 2`` cubetas, en orden."""
+    total = len(y)
+    if n >= total or n < 2:
+        return np.arange(total)
+    cubetas, tamano = _cubetas(y, n // 2)
+    validas = ~np.isnan(cubetas).all(axis=1)
+    desplazamiento = (np.arange(len(cubetas)) * tamano)[validas]
+    minimos = np.nanargmin(cubetas[validas], axis=1) + desplazamiento
+    maximos = np.nanargmax(cubetas[validas], axis=1) + desplazamiento
+    return np.unique(np.concatenate([[0, total - 1], minimos, maximos]))
+
+
+def reducir(x, y, presupuesto=PRESUPUESTO, metodo='lttb'):
+    """(x, y, reducida): la serie reducida a ~``presupuesto`` puntos si lo supera."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(y) <= presupuesto:
+        return x, y, False
+    if metodo not in METODOS:
+        raise ValueError(f"Método de reducción desconocido: {metodo} (use {', '.join(METODOS)})")
+    indices = lttb(x, y, presupuesto) if metodo == 'lttb' else minmax(y, presupuesto)
+    return x[indices], y[indices], True
+
+
+def trazar(ax, x, y, *args, presupuesto=PRESUPUESTO, metodo='lttb', **kwargs):
+    """``ax.plot`` que reduce y rasteriza la serie si supera ``presupuesto``.
+
+    En una serie reducida se omiten los marcadores (uno por punto no aporta
+    nada con miles de puntos); la leyenda conserva el estilo de la línea.
+    """
+    x, y, reducida = reducir(x, y, presupuesto, metodo)
+    if reducida:
+        kwargs.pop('marker', None)
+        kwargs.pop('markersize', None)
+        kwargs['rasterized'] = True
+    lineas = ax.plot(x, y, *args, **kwargs)
+    return lineas[0]
+
+
+def banda(ax, x, y1, y2, presupuesto=PRESUPUESTO, **kwargs):
+    """``ax.fill_between`` con la envolvente (mínimo de ``y1``, máximo de ``y2``) por cubeta."""
+    x = np.asarray(x, dtype=float)
+    y1 = np.asarray(y1, dtype=float)
+    y2 = np.asarray(y2, dtype=float)
+    if len(x) > presupuesto:
+        n = presupuesto // 2
+        cx, _ = _cubetas(x, n)
+        c1, _ = _cubetas(y1, n)
+        c2, _ = _cubetas(y2, n)
+        validas = ~np.isnan(cx).all(axis=1)
+        x = np.nanmean(cx[validas], axis=1)
+        y1 = np.nanmin(c1[validas], axis=1)
+        y2 = np.nanmax(c2[validas], axis=1)
+        kwargs['rasterized'] = True
+    return ax.fill_between(x, y1, y2, **kwargs)
@@ -0,0 +1,206 @@
+"""
+Agregador de logs de errores de producción para la Figura 7 (reducción de errores).
+
+Recorre los logs de la aplicación una sola vez, mapeados en memoria y por
+bloques de 1 MB alineados a fin de línea. Cada bloque se analiza con una
+única expresión regular precompilada (fecha al inicio de la línea + nivel
+de severidad) que corre en C sobre el mmap; de cada línea reconocida solo
+se copian la fecha y el nivel, y como mucho los de un bloque a la vez, así
+que la memoria no depende del tamaño del log. Las fechas se convierten a
+enteros en bloque con NumPy, los conteos día x severidad se acumulan con
+``np.bincount`` y el resultado
+se guarda en ``data/errores_resumen.json`` (mismo formato que el conjunto
+incluido ``errores_mensuales.json``, más los totales diarios del primer y el
+último mes, con los que la figura calcula el intervalo de confianza de la
+reducción), así que volver a graficar nunca relee los logs. La Figura 7 usa
+el resumen si existe y, si no, los datos incluidos, que nunca se modifican.
+
+Formato esperado de cada línea: la marca de tiempo ``AAAA-MM-DD[ T]hh:mm:ss...``
+(opcionalmente entre corchetes) y, justo después, el nivel en mayúsculas
+(opcionalmente entre corchetes). Las líneas INFO/DEBUG/TRACE no se cuentan
+aunque su mensaje mencione ERROR o WARN.
+
+Uso:
+    python errorlogs.py app-*.log --fase 2024-01:Monolítica --fase 2024-03:N-Capas
+"""
+
+import argparse
+import calendar
+import mmap
+import os
+import re
+import sys
+
+import numpy as np
+
+import escritura
+
+# Niveles de log -> severidad de la figura (índice en SEVERIDADES); los
+# niveles informativos se reconocen para descartarlos (IGNORAR)
+SEVERIDADES = ('criticos', 'medios', 'menores')
+IGNORAR = -1
+NIVELES = {
+    b'FATAL': 0, b'CRITICAL': 0, b'CRIT': 0, b'EMERG': 0, b'ALERT': 0,
+    b'ERROR': 1, b'ERR': 1, b'SEVERE': 1,
+    b'WARNING': 2, b'WARN': 2,
+    b'INFO': IGNORAR, b'NOTICE': IGNORAR, b'DEBUG': IGNORAR, b'TRACE': IGNORAR,
+}
+# El nivel es el token que sigue a la marca de tiempo, no cualquier palabra
+# de la línea: "INFO user typed WARN" es una línea INFO
+_PATRON = re.compile(
+    rb'^\[?(\d{4}-\d{2}-\d{2})(?:[T ][\d:.,]+)?(?:Z|[+-]\d{2}:?\d{2})?\]?'
+    rb'[ \t]+\[?(' + b'|'.join(sorted(NIVELES, key=len, reverse=True)) + rb')\b',
+    re.MULTILINE)
+
+BLOQUE = 1 << 20
+SALIDA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data',
+                      'errores_resumen.json')
+
+
+def _bloques(m, tamano):
+    """Rangos (inicio, fin) de ``m`` de ~``tamano`` bytes que terminan en fin de línea."""
+    inicio, total = 0, len(m)
+    while inicio < total:
+        fin = min(inicio + tamano, total)
+        if fin < total:
+            salto = m.find(b'\n', fin)
+            fin = total if salto < 0 else salto + 1
+        yield inicio, fin
+        inicio = fin
+
+
+def _liberar(m, inicio, fin):
+    """Devuelve al sistema las páginas del bloque ``inicio:fin`` ya analizado.
+
+    Sin esto las páginas leídas siguen contando en la memoria residente del
+    proceso hasta cerrar el archivo, es decir, tanto como el log.
+    """
+    desde, hasta = inicio - inicio % mmap.PAGESIZE, fin - fin % mmap.PAGESIZE
+    if hasta > desde and hasattr(mmap, 'MADV_DONTNEED'):
+        m.madvise(mmap.MADV_DONTNEED, desde, hasta - desde)
+
+
+def contar(rutas, tamano_bloque=BLOQUE):
+    """Conteos {día absoluto (mes absoluto*31 + día-1): array[3]} de todos los logs.
+
+    El mes absoluto es año*12 + mes-1. Hay una entrada por cada día con
+    alguna línea reconocida, aunque solo sea INFO/DEBUG (con ceros): las
+    claves dicen qué días cubre el log.
+    """
+    conteos = {}
+    for ruta in rutas:
+        if os.path.getsize(ruta) == 0:
+            continue
+        with open(ruta, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for inicio, fin in _bloques(m, tamano_bloque):
+                coincidencias = _PATRON.findall(m, inicio, fin)
+                _liberar(m, inicio, fin)
+                if not coincidencias:
+                    continue
+                fechas, niveles = zip(*coincidencias)
+                # Dígitos de 'AAAA-MM-DD' -> año, mes y día, sin pasar por int()
+                d = (np.frombuffer(b''.join(fechas), dtype=np.uint8).reshape(-1, 10)
+                     .astype(np.int64) - ord('0'))
+                anio = d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3]
+                mes = anio * 12 + d[:, 5] * 10 + d[:, 6] - 1
+                dia = mes * 31 + d[:, 8] * 10 + d[:, 9] - 1
+                nombres, idx_nivel = np.unique(np.array(niveles), return_inverse=True)
+                severidad = np.array([NIVELES[n] for n in nombres.tolist()],
+                                     dtype=np.int64)[idx_nivel]
+                contadas = severidad != IGNORAR
+                unicos, idx = np.unique(dia, return_inverse=True)
+                por_dia = np.bincount(idx[contadas] * len(SEVERIDADES) + severidad[contadas],
+                                      minlength=len(unicos) * len(SEVERIDADES))
+                for d_abs, fila in zip(unicos.tolist(), por_dia.reshape(-1, len(SEVERIDADES))):
+                    conteos[d_abs] = conteos.get(d_abs, 0) + fila
+    return conteos
+
+
+def _etiqueta(mes_abs):
+    return f'{mes_abs // 12:04d}-{mes_abs % 12 + 1:02d}'
+
+
+def _diarios(conteos, mes_abs):
+    """Total de errores de cada día del mes que cubre el log.
+
+    Incluye los días sin errores entre la primera y la última línea del log,
+    pero no los anteriores ni los posteriores: un log que empieza el día 20
+    no aporta diecinueve días con cero errores.
+    """
+    dias = calendar.monthrange(mes_abs // 12, mes_abs % 12 + 1)[1]
+    desde = max(mes_abs * 31, min(conteos))
+    hasta = min(mes_abs * 31 + dias - 1, max(conteos))
+    vacio = np.zeros(len(SEVERIDADES), dtype=np.int64)
+    return [int(conteos.get(d, vacio).sum()) for d in range(desde, hasta + 1)]
+
+
+def resumen(conteos, fases=()):
+    """Serie mensual continua con el formato de data/errores_mensuales.json.
+
+    ``fases`` es una lista de (``'AAAA-MM'``, nombre) con el mes de inicio de
+    cada fase; la fase se anota en la etiqueta de su primer mes. La
+    reducción compara la media diaria de errores del primer y el último mes
+    en los días que cubre el log (el mismo estadístico cuyo intervalo
+    bootstrap calcula la Figura 7), así un mes incompleto no la sesga.
+    """
+    if not any(fila.any() for fila in conteos.values()):
+        raise ValueError('No se encontraron líneas de error en los logs')
+    primero, ultimo = min(conteos) // 31, max(conteos) // 31
+    matriz = np.zeros((ultimo - primero + 1, len(SEVERIDADES)), dtype=np.int64)
+    for dia_abs, fila in conteos.items():
+        matriz[dia_abs // 31 - primero] += fila
+
+    inicios = sorted((int(a) * 12 + int(m) - 1, nombre)
+                     for (a, m), nombre in ((f.split('-'), n) for f, n in fases))
+    meses, fase_mes = [], []
+    for i in range(len(matriz)):
+        mes_abs = primero + i
+        actual = [n for inicio, n in inicios if inicio <= mes_abs]
+        fase_mes.append(actual[-1] if actual else '')
+        nueva = any(inicio == mes_abs for inicio, _ in inicios)
+        meses.append(_etiqueta(mes_abs) + (f'\n({fase_mes[-1]})' if nueva else ''))
+
+    salida = {'meses': meses, **{s: matriz[:, j].tolist() for j, s in enumerate(SEVERIDADES)}}
+    if inicios:
+        salida['fase'] = fase_mes
+    salida['diarios_inicio'] = _diarios(conteos, primero)
+    salida['diarios_fin'] = _diarios(conteos, ultimo)
+    antes, despues = np.mean(salida['diarios_inicio']), np.mean(salida['diarios_fin'])
+    if antes:
+        salida['reduccion'] = round(float((antes - despues) / antes * 100), 2)
+    return salida
+
+
+def guardar(datos, ruta):
+    """Escribe el resumen como JSON de forma atómica."""
+    escritura.escribir_json(ruta, datos, ensure_ascii=False, indent=2)
+
+
+def _fase(valor):
+    mes, sep, nombre = valor.partition(':')
+    if not sep or not re.fullmatch(r'\d{4}-\d{2}', mes) or not nombre:
+        raise argparse.ArgumentTypeError("use AAAA-MM:Nombre, p. ej. 2024-03:N-Capas")
+    return mes, nombre
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('logs', nargs='+', help='Archivos de log de la aplicación')
+    parser.add_argument('-o', '--output', default=SALIDA,
+                        help='Archivo de resumen (por defecto: data/errores_resumen.json)')
+    parser.add_argument('--fase', action='append', default=[], type=_fase,
+                        metavar='AAAA-MM:NOMBRE', help='Inicio de una fase del proyecto (repetible)')
+    args = parser.parse_args(argv)
+
+    datos = resumen(contar(args.logs), args.fase)
+    guardar(datos, args.output)
+    print(f"✓ {len(datos['meses'])} meses, "
+          + ", ".join(f"{sum(datos[s])} {s}" for s in SEVERIDADES))
+    if 'reduccion' in datos:
+        print(f"  Reducción total: {datos['reduccion']:.0f}%")
+    print(f"📁 Resumen: {os.path.abspath(args.output)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Escritura atómica de archivos: temporal en el mismo directorio + rename.
+
+``tempfile.mkstemp`` crea el temporal con permisos 0600, y el rename los
+conserva: el archivo final quedaría legible solo por su dueño (p. ej. root
+en el contenedor de Docker, sobre un directorio montado del anfitrión).
+``temporal`` lo crea en cambio con ``os.open(..., 0o666)``, que aplica la
+umask del proceso como cualquier archivo nuevo.
+"""
+
+import json
+import os
+import secrets
+
+
+def temporal(directorio, prefijo='.tmp-', sufijo=''):
+    """Crea un archivo temporal vacío en ``directorio``; devuelve (fd, ruta).
+
+    Como ``tempfile.mkstemp``, pero con los permisos de un archivo nuevo.
+    """
+    while True:
+        ruta = os.path.join(directorio, f'{prefijo}{secrets.token_hex(8)}{sufijo}')
+        try:
+            return os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666), ruta
+        except FileExistsError:
+            continue
+
+
+def escribir_json(ruta, datos, **opciones):
+    """Escribe ``datos`` como JSON en ``ruta`` de forma atómica.
+
+    ``opciones`` se pasan a ``json.dump``. Si algo falla, se borra el
+    temporal y ``ruta`` conserva su contenido anterior.
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    fd, tmp = temporal(directorio, os.path.basename(ruta), '.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, **opciones)
+            f.write('\n')
+        os.replace(tmp, ruta)
+    except BaseException:
+        os.unlink(tmp)
+        raise
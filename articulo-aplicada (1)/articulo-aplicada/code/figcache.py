@@ -0,0 +1,49 @@
+"""
+Caché incremental para la generación de figuras.
+
+Guarda en ``<directorio de salida>/.figcache.json`` una huella (hash SHA-256)
+por archivo de salida (figura y formato) calculada a partir de todo lo que
+determina su resultado: código fuente, datos de entrada, estilo de
+matplotlib y opciones del formato. Si la huella no cambia y el archivo sigue
+existiendo, no se vuelve a renderizar y conserva la fecha de modificación
+(latexmk no recompila por él).
+"""
+
+import hashlib
+import json
+import os
+
+import escritura
+
+MANIFIESTO = '.figcache.json'
+VERSION = 2
+
+
+def huella(*partes):
+    """Hash estable de una secuencia de valores serializables a JSON."""
+    contenido = json.dumps(partes, sort_keys=True, default=repr, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def cargar_manifiesto(directorio):
+    """Lee el manifiesto; devuelve un diccionario vacío si no existe o es inválido."""
+    try:
+        with open(os.path.join(directorio, MANIFIESTO), encoding='utf-8') as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if datos.get('version') != VERSION:
+        return {}
+    return datos.get('figuras', {})
+
+
+def guardar_manifiesto(directorio, figuras):
+    """Escribe el manifiesto de forma atómica (archivo temporal + rename)."""
+    escritura.escribir_json(os.path.join(directorio, MANIFIESTO),
+                            {'version': VERSION, 'figuras': figuras},
+                            indent=2, sort_keys=True, ensure_ascii=False)
+
+
+def vigente(manifiesto, nombre, clave, rutas):
+    """True si la entrada ``nombre`` ya se generó con la misma huella y sus salidas existen."""
+    return manifiesto.get(nombre) == clave and all(os.path.exists(r) for r in rutas)
@@ -0,0 +1,139 @@
+"""
+Exportación de figuras terminadas a uno o varios formatos.
+
+``savefig(..., bbox_inches='tight')`` vuelve a calcular el layout y la caja
+ajustada en cada llamada. Aquí la caja se calcula una sola vez por figura y
+se reutiliza para todos los formatos, de modo que añadir un formato solo
+cuesta su propio dibujado. Cada archivo se escribe primero en un temporal
+del mismo directorio y después se renombra, así un fallo a mitad de
+escritura nunca deja un PDF/PNG truncado que LaTeX pueda llegar a leer.
+
+La salida es reproducible byte a byte: sin fecha de creación en PDF/SVG (o
+la de ``SOURCE_DATE_EPOCH`` si está definida), sal fija para los ids del SVG
+y PNG sin marcas de tiempo; las fuentes se incrustan en el orden en que se
+dibujan, que es siempre el mismo. Si el archivo nuevo es idéntico al que ya
+existe no se reemplaza, así su fecha de modificación no cambia y latexmk no
+recompila los documentos por él.
+"""
+
+import filecmp
+import os
+
+import escritura
+import figtrace
+
+
+def _sin_fecha(clave):
+    """Metadatos sin fecha de creación, salvo que SOURCE_DATE_EPOCH la fije."""
+    if 'SOURCE_DATE_EPOCH' in os.environ:
+        return {}     # matplotlib ya usa SOURCE_DATE_EPOCH como fecha
+    return {'metadata': {clave: None}}
+
+
+# Opciones de savefig por formato. 'pgf' requiere una instalación de LaTeX
+# (usa xelatex, igual que la compilación del artículo) y deja el texto como
+# código LaTeX nativo, con la tipografía del documento.
+OPCIONES = {
+    'pdf': {'dpi': 300, **_sin_fecha('CreationDate')},
+    'png': {'dpi': 300, 'pil_kwargs': {'compress_level': 6}},
+    'svg': {'dpi': 300, **_sin_fecha('Date')},
+    'pgf': {'dpi': 300},
+}
+
+# rcParams que se fijan solo durante la exportación
+RC_EXPORTACION = {'svg.hashsalt': 'articulo-aplicada'}
+
+
+def caja_ajustada(fig):
+    """Caja 'tight' de la figura en pulgadas, con el margen de savefig.pad_inches.
+
+    Fija el layout actual: ``tight_layout`` deja en la figura un motor de
+    layout (y ``set_layout_engine('none')`` lo cambia por otro) que haría
+    que cada ``savefig`` volviera a dibujarla antes de guardar, aunque la
+    caja ya esté calculada. Sin motor, cada formato se dibuja una sola vez.
+    """
+    import matplotlib as mpl
+
+    with mpl.rc_context({'figure.autolayout': False,
+                         'figure.constrained_layout.use': False}):
+        fig.set_layout_engine(None)
+    fig.draw_without_rendering()
+    caja = fig.get_tightbbox(fig.canvas.get_renderer())
+    return caja.padded(mpl.rcParams['savefig.pad_inches'])
+
+
+def escribir_atomico(fig, ruta, formato, caja):
+    """Guarda la figura en ``ruta`` vía archivo temporal + rename.
+
+    Devuelve False (y deja intacto el archivo) si el contenido no cambió.
+    """
+    import matplotlib as mpl
+
+    directorio = os.path.dirname(ruta) or '.'
+    fd, tmp = escritura.temporal(directorio, sufijo=f'.{formato}')
+    os.close(fd)
+    try:
+        with mpl.rc_context(RC_EXPORTACION):
+            fig.savefig(tmp, format=formato, bbox_inches=caja, **OPCIONES[formato])
+        if os.path.exists(ruta) and filecmp.cmp(tmp, ruta, shallow=False):
+            os.unlink(tmp)
+            return False
+        os.replace(tmp, ruta)
+        return True
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def exportar(fig, base, formatos):
+    """Escribe ``fig`` como ``<base>.<ext>`` para cada formato.
+
+    Devuelve las rutas que realmente se reescribieron (las que cambiaron).
+    """
+    desconocidos = [f for f in formatos if f not in OPCIONES]
+    if desconocidos:
+        raise ValueError(f"Formatos no soportados: {', '.join(desconocidos)}")
+
+    with figtrace.fase('caja ajustada', 'exportar'):
+        caja = caja_ajustada(fig)
+    escritas = []
+    for formato in formatos:
+        ruta = f'{base}.{formato}'
+        with figtrace.fase(f'savefig {formato}', 'exportar', dpi=OPCIONES[formato].get('dpi')):
+            if escribir_atomico(fig, ruta, formato, caja):
+                escritas.append(ruta)
+    return escritas
+
+
+def exportar_paginas(figuras, ruta):
+    """Escribe cada figura de ``figuras`` como una página de un único PDF.
+
+    Todas las páginas comparten un solo subconjunto de cada fuente (PdfPages
+    incrusta las fuentes una vez, al cerrar el archivo); cada página tiene el
+    tamaño de la caja ajustada de su figura. ``figuras`` puede ser un
+    generador: cada figura se guarda antes de pedir la siguiente. Devuelve
+    True si el archivo cambió.
+    """
+    import matplotlib as mpl
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    opciones = dict(OPCIONES['pdf'])
+    metadatos = opciones.pop('metadata', None)
+    directorio = os.path.dirname(ruta) or '.'
+    fd, tmp = escritura.temporal(directorio, sufijo='.pdf')
+    os.close(fd)
+    try:
+        with mpl.rc_context(RC_EXPORTACION), PdfPages(tmp, metadata=metadatos) as paginas:
+            for fig in figuras:
+                with figtrace.fase('página', 'exportar'):
+                    paginas.savefig(fig, bbox_inches=caja_ajustada(fig), **opciones)
+        if os.path.exists(ruta) and filecmp.cmp(tmp, ruta, shallow=False):
+            os.unlink(tmp)
+            return False
+        os.replace(tmp, ruta)
+        return True
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
@@ -0,0 +1,112 @@
+"""
+Trazas de tiempo de la generación de figuras en formato Chrome trace / Perfetto.
+
+Desactivado por defecto: ``fase()`` devuelve entonces un contexto nulo
+compartido y no se parchea nada, así que no tiene coste. Con ``activar()``
+cada fase se registra como un evento completo (``ph: 'X'``) con el PID y el
+hilo del proceso que la ejecuta; ``instrumentar()`` envuelve además los
+puntos calientes de matplotlib (``plt.subplots``, ``Figure.draw`` y la
+codificación PNG con PIL). Los procesos del pool devuelven sus eventos con
+cada resultado y el proceso principal los une con ``escribir()``. El archivo
+se abre en https://ui.perfetto.dev o en chrome://tracing.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+_eventos = None
+_instrumentado = False
+_NULO = contextlib.nullcontext()
+
+
+def activo():
+    return _eventos is not None
+
+
+def activar():
+    """Empieza a registrar eventos en este proceso (idempotente)."""
+    global _eventos
+    if _eventos is None:
+        _eventos = []
+
+
+def extraer():
+    """Devuelve y vacía los eventos registrados en este proceso."""
+    if _eventos is None:
+        return []
+    eventos = list(_eventos)
+    _eventos.clear()
+    return eventos
+
+
+class _Fase:
+    __slots__ = ('nombre', 'categoria', 'args', 'inicio')
+
+    def __init__(self, nombre, categoria, args):
+        self.nombre, self.categoria, self.args = nombre, categoria, args
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tipo, valor, tb):
+        fin = time.perf_counter_ns()
+        if tipo is not None:
+            self.args = {**self.args, 'error': tipo.__name__}
+        _eventos.append({
+            'name': self.nombre, 'cat': self.categoria, 'ph': 'X',
+            # perf_counter es un reloj monotónico común a todos los procesos
+            'ts': self.inicio / 1000, 'dur': (fin - self.inicio) / 1000,
+            'pid': os.getpid(), 'tid': threading.get_native_id(), 'args': self.args,
+        })
+        return False
+
+
+def fase(nombre, categoria='figura', **args):
+    """Contexto que registra la duración de una fase (nulo si no hay traza activa)."""
+    if _eventos is None:
+        return _NULO
+    return _Fase(nombre, categoria, args)
+
+
+def _envolver(objeto, atributo, nombre):
+    original = getattr(objeto, atributo)
+
+    @functools.wraps(original)
+    def envuelto(*args, **kwargs):
+        with fase(nombre, 'matplotlib'):
+            return original(*args, **kwargs)
+
+    setattr(objeto, atributo, envuelto)
+
+
+def instrumentar():
+    """Envuelve los puntos calientes de matplotlib; solo si la traza está activa."""
+    global _instrumentado
+    if _eventos is None or _instrumentado:
+        return
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    _envolver(plt, 'subplots', 'plt.subplots')
+    _envolver(Figure, 'draw', 'Figure.draw')
+    _envolver(Image.Image, 'save', 'codificar imagen (PIL)')
+    _instrumentado = True
+
+
+def escribir(ruta, eventos, principal=None):
+    """Guarda ``eventos`` como archivo de traza, nombrando cada proceso."""
+    principal = os.getpid() if principal is None else principal
+    pids = sorted({e['pid'] for e in eventos} | {principal})
+    nombres = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                'args': {'name': 'generate_figures (principal)' if pid == principal
+                         else f'worker {pid}'}}
+               for pid in pids]
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': nombres + sorted(eventos, key=lambda e: e['ts']),
+                   'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
@@ -0,0 +1,140 @@
+"""
+Modo observación (``render --watch``) de generate_figures.
+
+Mantiene un único intérprete con matplotlib ya importado y la caché de
+fuentes caliente, y vigila por sondeo el script de figuras, los archivos de
+datos y el matplotlibrc. Ante un cambio:
+
+* si cambió el script, vuelve a ejecutar su código en un módulo nuevo (las
+  funciones ``figN_*`` y ``ESTILO`` quedan al día sin reiniciar el proceso);
+* renderiza en el propio proceso solo las figuras cuya huella cambió
+  (código de la función, datos, estilo), igual que el modo incremental;
+* si cambió el matplotlibrc, lo vuelve a leer y regenera todas;
+* no regenera el PDF combinado (``render --bundle``), que exige renderizar
+  todas las figuras; si existe y queda desactualizado, lo elimina para que
+  ``\grafica`` use los PDF de cada figura.
+
+Los cambios en los módulos auxiliares (datasets, figexport...) requieren
+reiniciar el modo observación.
+"""
+
+import linecache
+import os
+import time
+import traceback
+import types
+
+import datasets
+
+INTERVALO = 0.25      # segundos entre sondeos
+ESTABILIZAR = 0.05    # espera tras un cambio, por si el editor escribe en varios pasos
+
+
+def _rc_matplotlib():
+    import matplotlib
+    return matplotlib.matplotlib_fname()
+
+
+def _vigilados(script):
+    """Rutas a vigilar: el script, el matplotlibrc y los datos de cada directorio."""
+    rutas = {script: 'script', _rc_matplotlib(): 'estilo'}
+    for directorio in datasets.directorios():
+        if os.path.isdir(directorio):
+            for entrada in os.scandir(directorio):
+                if entrada.name.rsplit('.', 1)[-1] in datasets.EXTENSIONES:
+                    rutas[entrada.path] = 'datos'
+    return rutas
+
+
+def _estado(rutas):
+    """Firma (mtime, tamaño) de cada ruta; None si no existe."""
+    estado = {}
+    for ruta in rutas:
+        try:
+            st = os.stat(ruta)
+            estado[ruta] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            estado[ruta] = None
+    return estado
+
+
+def recargar(script):
+    """Ejecuta de nuevo ``script`` en un módulo nuevo y lo devuelve."""
+    linecache.checkcache(script)      # inspect.getsource debe ver el código nuevo
+    with open(script, 'rb') as f:
+        codigo = compile(f.read(), script, 'exec')
+    modulo = types.ModuleType('generate_figures')
+    modulo.__file__ = script
+    exec(codigo, modulo.__dict__)
+    return modulo
+
+
+def _calentar(modulo):
+    """Importa matplotlib y carga las fuentes con un dibujado mínimo."""
+    modulo._cargar_matplotlib()
+    fig = modulo.plt.figure(figsize=(1, 1))
+    fig.text(0.5, 0.5, 'Áj', fontsize=modulo.ESTILO.get('font.size', 10))
+    fig.canvas.draw()
+    modulo.plt.close(fig)
+
+
+def _aplicar_estilo(modulo):
+    """Vuelve a leer el matplotlibrc y aplica encima el ESTILO de ``modulo``."""
+    import matplotlib
+    modulo._cargar_matplotlib()
+    rc = matplotlib.rc_params()
+    matplotlib.rcParams.update({k: v for k, v in rc.items() if k != 'backend'})
+    matplotlib.rcParams.update(modulo.ESTILO)
+
+
+def observar(modulo, seleccion, intervalo=INTERVALO):
+    """Bucle de observación; termina con Ctrl+C.
+
+    ``modulo`` es el módulo generate_figures ya cargado y ``seleccion`` una
+    función que, dado un módulo, devuelve ``(figuras, formatos)`` a
+    renderizar (se vuelve a evaluar tras cada recarga del script).
+    """
+    script = os.path.abspath(modulo.__file__)
+    _calentar(modulo)
+    rutas = _vigilados(script)
+    anterior = _estado(rutas)
+    print(f"👀 Observando {len(rutas)} archivos (Ctrl+C para salir)...")
+
+    try:
+        while True:
+            time.sleep(intervalo)
+            rutas = _vigilados(script)
+            actual = _estado(rutas)
+            if actual == anterior:
+                continue
+            time.sleep(ESTABILIZAR)
+            actual = _estado(rutas)
+            cambiados = sorted(r for r in set(actual) | set(anterior)
+                               if actual.get(r) != anterior.get(r))
+            anterior = actual
+            tipos = {rutas.get(r, 'datos') for r in cambiados}
+            print(f"\n⟳ Cambios: {', '.join(os.path.basename(r) for r in cambiados)}")
+
+            inicio = time.perf_counter()
+            if 'script' in tipos:
+                try:
+                    nuevo = recargar(script)
+                except Exception:
+                    print(traceback.format_exc(), end='')
+                    print("❌ El script tiene errores; se mantiene la versión anterior")
+                    continue
+                modulo = nuevo
+            if tipos & {'script', 'estilo'}:
+                # Parte de cero para que no queden claves retiradas de ESTILO
+                _aplicar_estilo(modulo)
+
+            figuras, formatos = seleccion(modulo)
+            fallidas = modulo.generar_incremental(figuras, jobs=1, formatos=formatos,
+                                                  forzar='estilo' in tipos)
+            if modulo.paquete_desactualizado():
+                modulo.retirar_paquete()
+            estado = f"❌ {len(fallidas)} fallaron" if fallidas else "✓ Actualizado"
+            print(f"{estado} en {time.perf_counter() - inicio:.2f} s")
+    except KeyboardInterrupt:
+        print("\nFin del modo observación")
+    return 0
@@ -4,30 +4,85 @@ Genera visualizaciones para: métricas del proyecto, comparativas de patrones,
 evolución arquitectónica y resultados de rendimiento
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, Circle, Rectangle, FancyArrowPatch
+import argparse
+import contextlib
+import fnmatch
+import inspect
+import io
 import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from importlib import metadata
 
-# Configuración de estilo
-plt.rcParams['font.family'] = 'serif'
-plt.rcParams['font.size'] = 10
-plt.rcParams['figure.dpi'] = 300
+import datasets
+import figcache
+import figexport
+import figtrace
+import figwatch
+import latexrefs
+
+# matplotlib y numpy se importan de forma diferida (ver _cargar_matplotlib):
+# listar figuras o consultar la caché no paga su tiempo de importación
+matplotlib = plt = np = mpatches = diezmado = estadistica = None
+
+# Configuración de estilo (se aplica a rcParams al cargar matplotlib)
+ESTILO = {
+    'font.family': 'serif',
+    'font.size': 10,
+    'figure.dpi': 300,
+}
+
+# Formatos que escribe cada figura por defecto (ver figexport.OPCIONES)
+FORMATOS = ('pdf', 'png')
+
+# Puntos por serie a partir de los cuales las figuras de líneas reducen la
+# serie y la rasterizan dentro del PDF (ver diezmado.py)
+PUNTOS_POR_SERIE = 2000
 
 # Crear directorio de salida
 output_dir = '../graphics'
 os.makedirs(output_dir, exist_ok=True)
 
+# ============================================================================
+# Registro de figuras
+# ============================================================================
+@dataclass(frozen=True)
+class Figura:
+    numero: int
+    nombre: str           # Nombre de la función, p. ej. fig6_impacto_solid
+    salida: str           # Nombre base de los archivos en output_dir
+    etiquetas: tuple
+    datos: tuple          # Conjuntos de datos (ver datasets.py), en orden de argumentos
+    funcion: object
+
+
+REGISTRO = {}
+
+
+def figura(salida, etiquetas=(), datos=()):
+    """Decorador que registra una función de figura con su nombre de salida.
+
+    La función recibe ya cargado cada conjunto de ``datos``, construye la
+    figura y la devuelve; el ajuste de layout, la exportación y el cierre
+    los hace _ejecutar_figura.
+    """
+    def registrar(func):
+        REGISTRO[func.__name__] = Figura(len(REGISTRO) + 1, func.__name__, salida,
+                                         tuple(etiquetas), tuple(datos), func)
+        return func
+    return registrar
+
 # ============================================================================
 # FIGURA 1: Métricas del Proyecto - Componentes Implementados
 # ============================================================================
-def fig1_metricas_componentes():
+@figura('metricas_componentes', etiquetas=('barras',), datos=('componentes',))
+def fig1_metricas_componentes(datos):
     fig, ax = plt.subplots(figsize=(7, 5))
     
-    componentes = ['Controladores', 'Servicios', 'Repositorios', 
-                   'Entidades', 'Interfaces', 'Builders']
-    cantidades = [38, 39, 37, 40, 75, 4]
+    componentes = datos['componente']
+    cantidades = datos['cantidad']
     colores = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
     
     bars = ax.barh(componentes, cantidades, color=colores, alpha=0.8, edgecolor='black')
@@ -42,36 +97,52 @@ def fig1_metricas_componentes():
     ax.grid(axis='x', alpha=0.3, linestyle='--')
     ax.set_xlim(0, max(cantidades) * 1.15)
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/metricas_componentes.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/metricas_componentes.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 1 generada: metricas_componentes")
+    return fig
 
 # ============================================================================
 # FIGURA 2: Comparativa de Tiempos - Antes vs Después de Patrones
 # ============================================================================
-def fig2_comparativa_tiempos():
+@figura('comparativa_tiempos', etiquetas=('barras', 'comparativa'),
+        datos=('tiempos_tareas',))
+def fig2_comparativa_tiempos(datos):
     fig, ax = plt.subplots(figsize=(8, 5))
     
-    tareas = ['Onboarding\nDesarrolladores', 'Cambio de\nBase de Datos', 
-              'Agregar\nNuevo Módulo', 'Refactoring\nMayor']
-    sin_patrones = [12, 20, 15, 25]  # días
-    con_patrones = [2.5, 1, 3, 8]    # días
+    tareas = datos['tareas']
+    sin_patrones = datos['sin_patrones']  # días
+    con_patrones = datos['con_patrones']  # días
+    
+    # Con las mediciones individuales de cada tarea (opcionales) las barras
+    # son medias con su IC 95 % bootstrap y la mejora lleva su intervalo
+    muestras_sin = datos.get('muestras_sin_patrones')
+    muestras_con = datos.get('muestras_con_patrones')
+    errores = {'sin': None, 'con': None}
+    mejoras = None
+    if muestras_sin is not None and muestras_con is not None:
+        medias_sin = [estadistica.media(m) for m in muestras_sin]
+        medias_con = [estadistica.media(m) for m in muestras_con]
+        sin_patrones = np.array([m.valor for m in medias_sin])
+        con_patrones = np.array([m.valor for m in medias_con])
+        errores['sin'] = np.column_stack([m.error for m in medias_sin])
+        errores['con'] = np.column_stack([m.error for m in medias_con])
+        mejoras = [estadistica.reduccion_relativa(a, d) for a, d in zip(muestras_sin, muestras_con)]
     
     x = np.arange(len(tareas))
     width = 0.35
     
+    barras_error = lambda error: {} if error is None else {'yerr': error, 'capsize': 4}
     bars1 = ax.bar(x - width/2, sin_patrones, width, label='Sin Patrones', 
-                   color='#e74c3c', alpha=0.8, edgecolor='black')
+                   color='#e74c3c', alpha=0.8, edgecolor='black', **barras_error(errores['sin']))
     bars2 = ax.bar(x + width/2, con_patrones, width, label='Con Patrones', 
-                   color='#2ecc71', alpha=0.8, edgecolor='black')
+                   color='#2ecc71', alpha=0.8, edgecolor='black', **barras_error(errores['con']))
     
-    # Etiquetas de valores
-    for bars in [bars1, bars2]:
-        for bar in bars:
+    # Etiquetas de valores (sobre el bigote si hay barras de error)
+    topes = {}
+    for bars, error in [(bars1, errores['sin']), (bars2, errores['con'])]:
+        for i, bar in enumerate(bars):
             height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
+            tope = height + (error[1][i] if error is not None else 0)
+            topes[i] = max(topes.get(i, 0), tope)
+            ax.text(bar.get_x() + bar.get_width()/2., tope,
                    f'{height:.1f}d', ha='center', va='bottom', fontweight='bold')
     
     ax.set_ylabel('Tiempo (días)', fontweight='bold')
@@ -79,31 +150,39 @@ def fig2_comparativa_tiempos():
                  fontweight='bold', fontsize=12)
     ax.set_xticks(x)
     ax.set_xticklabels(tareas)
-    ax.legend(loc='upper right')
+    if mejoras is None:
+        ax.legend(loc='upper right')
+    else:
+        # Las etiquetas con intervalo llegan hasta el borde superior: la
+        # leyenda va fuera de los ejes para no taparlas
+        ax.legend(loc='upper left', bbox_to_anchor=(1.01, 1), borderaxespad=0)
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Agregar porcentajes de mejora
     for i, (antes, despues) in enumerate(zip(sin_patrones, con_patrones)):
-        mejora = ((antes - despues) / antes) * 100
-        ax.text(i, max(antes, despues) + 1.5, f'↓{mejora:.0f}%', 
+        if mejoras is None:
+            texto = f'↓{((antes - despues) / antes) * 100:.0f}%'
+        else:
+            texto = f'↓{mejoras[i].valor:.0f}% [{mejoras[i].inferior:.0f}–{mejoras[i].superior:.0f}]'
+        ax.text(i, topes[i] + 1.5, texto, 
                ha='center', fontweight='bold', color='green', fontsize=9)
+    if mejoras is not None:
+        # Espacio para los intervalos sobre los bigotes
+        ax.set_ylim(top=max(topes.values()) * 1.25)
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/comparativa_tiempos.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/comparativa_tiempos.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 2 generada: comparativa_tiempos")
+    return fig
 
 # ============================================================================
 # FIGURA 3: Cobertura de Pruebas por Capa
 # ============================================================================
-def fig3_cobertura_pruebas():
+@figura('cobertura_pruebas', etiquetas=('pastel', 'barras', 'multipanel'),
+        datos=('cobertura',))
+def fig3_cobertura_pruebas(datos):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
     
     # Gráfica de pastel - Cobertura actual
-    capas = ['API\nControllers', 'Business\nServices', 'Data\nRepositories', 
-             'Entity\nModels']
-    cobertura = [85, 95, 90, 100]
+    capas = datos['capas']
+    cobertura = datos['cobertura']
     colores = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12']
     
     wedges, texts, autotexts = ax1.pie(cobertura, labels=capas, autopct='%1.0f%%',
@@ -117,7 +196,7 @@ def fig3_cobertura_pruebas():
                   fontweight='bold', fontsize=11)
     
     # Gráfica de barras - Líneas de código testeadas
-    lineas_codigo = [1200, 3500, 2800, 1500]
+    lineas_codigo = datos['lineas_codigo']
     lineas_testeadas = [int(loc * cob / 100) for loc, cob in zip(lineas_codigo, cobertura)]
     
     x = np.arange(len(capas))
@@ -135,31 +214,37 @@ def fig3_cobertura_pruebas():
     ax2.legend()
     ax2.grid(axis='y', alpha=0.3, linestyle='--')
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/cobertura_pruebas.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/cobertura_pruebas.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 3 generada: cobertura_pruebas")
+    return fig
 
 # ============================================================================
 # FIGURA 4: Evolución de la Arquitectura
 # ============================================================================
-def fig4_evolucion_arquitectura():
+@figura('evolucion_arquitectura', etiquetas=('barras', 'tendencia'),
+        datos=('evolucion_fases',))
+def fig4_evolucion_arquitectura(datos):
     fig, ax = plt.subplots(figsize=(10, 5))
     
-    fases = ['Fase 1\nMonolito', 'Fase 2\nN-Capas', 'Fase 3\nN-Capas + DDD', 
-             'Fase 4\nMicroservicios\n(Planificado)']
-    complejidad = [30, 50, 70, 90]
-    mantenibilidad = [40, 75, 85, 95]
-    escalabilidad = [20, 60, 75, 98]
+    fases = datos['fases']
+    complejidad = datos['complejidad']
+    mantenibilidad = datos['mantenibilidad']
+    escalabilidad = datos['escalabilidad']
     
     x = np.arange(len(fases))
     width = 0.25
     
+    # Mediciones individuales de mantenibilidad por fase (opcionales): barras
+    # con IC 95 % y tendencia con banda bootstrap
+    muestras = datos.get('muestras_mantenibilidad')
+    error = {}
+    if muestras is not None:
+        medias = [estadistica.media(m) for m in muestras]
+        mantenibilidad = np.array([m.valor for m in medias])
+        error = {'yerr': np.column_stack([m.error for m in medias]), 'capsize': 4}
+    
     bars1 = ax.bar(x - width, complejidad, width, label='Complejidad Inicial', 
                    color='#e74c3c', alpha=0.8, edgecolor='black')
     bars2 = ax.bar(x, mantenibilidad, width, label='Mantenibilidad', 
-                   color='#3498db', alpha=0.8, edgecolor='black')
+                   color='#3498db', alpha=0.8, edgecolor='black', **error)
     bars3 = ax.bar(x + width, escalabilidad, width, label='Escalabilidad', 
                    color='#2ecc71', alpha=0.8, edgecolor='black')
     
@@ -174,30 +259,33 @@ def fig4_evolucion_arquitectura():
     ax.set_ylim(0, 110)
     
     # Agregar línea de tendencia para mantenibilidad
-    z = np.polyfit(x, mantenibilidad, 2)
-    p = np.poly1d(z)
     x_smooth = np.linspace(x.min(), x.max(), 100)
-    ax.plot(x_smooth, p(x_smooth), "b--", alpha=0.5, linewidth=2)
-    
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/evolucion_arquitectura.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/evolucion_arquitectura.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 4 generada: evolucion_arquitectura")
+    if muestras is None:
+        z = np.polyfit(x, mantenibilidad, 2)
+        p = np.poly1d(z)
+        ax.plot(x_smooth, p(x_smooth), "b--", alpha=0.5, linewidth=2)
+    else:
+        xs = np.concatenate([np.full(len(m), i) for i, m in enumerate(muestras)])
+        ys = np.concatenate([np.asarray(m, dtype=float) for m in muestras])
+        tendencia = estadistica.tendencia(xs, ys, 2, x_smooth)
+        ax.plot(x_smooth, tendencia.valor, "b--", alpha=0.5, linewidth=2)
+        ax.fill_between(x_smooth, tendencia.inferior, tendencia.superior,
+                        color='b', alpha=0.1, linewidth=0)
+    
+    return fig
 
 # ============================================================================
 # FIGURA 5: Uso de Patrones de Diseño en el Proyecto
 # ============================================================================
-def fig5_uso_patrones():
+@figura('uso_patrones', etiquetas=('barras',), datos=('uso_patrones',))
+def fig5_uso_patrones(datos):
     fig, ax = plt.subplots(figsize=(8, 6))
     
-    patrones = ['Repository', 'Builder', 'Singleton', 'Observer\n(SignalR)', 
-                'Facade', 'Factory', 'Proxy\n(JWT)']
-    frecuencia = [37, 4, 8, 12, 5, 6, 15]  # Número de implementaciones
+    patrones = datos['patrones']
+    frecuencia = datos['frecuencia']  # Número de implementaciones
     categoria_colores = {'Creacional': '#3498db', 'Estructural': '#e74c3c', 
                         'Comportamiento': '#2ecc71'}
-    categorias = ['Estructural', 'Creacional', 'Creacional', 'Comportamiento', 
-                  'Estructural', 'Creacional', 'Estructural']
+    categorias = datos['categorias']
     colores = [categoria_colores[c] for c in categorias]
     
     bars = ax.barh(patrones, frecuencia, color=colores, alpha=0.8, edgecolor='black')
@@ -217,21 +305,16 @@ def fig5_uso_patrones():
                       for cat, color in categoria_colores.items()]
     ax.legend(handles=legend_elements, loc='lower right', title='Categoría')
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/uso_patrones.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/uso_patrones.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 5 generada: uso_patrones")
+    return fig
 
 # ============================================================================
 # FIGURA 6: Impacto de SOLID en Métricas de Código
 # ============================================================================
-def fig6_impacto_solid():
-    principios = ['SRP\nResponsabilidad\nÚnica', 'OCP\nAbierto/Cerrado', 
-                  'LSP\nSustitución\nLiskov', 'ISP\nSegregación\nInterfaces', 
-                  'DIP\nInversión\nDependencias']
-    cumplimiento = [95, 88, 92, 90, 98]  # Porcentaje de cumplimiento
-    impacto_calidad = [9.2, 8.5, 8.8, 8.7, 9.5]  # Impacto en calidad (0-10)
+@figura('impacto_solid', etiquetas=('barras', 'multipanel'), datos=('solid',))
+def fig6_impacto_solid(datos):
+    principios = datos['principios']
+    cumplimiento = datos['cumplimiento']  # Porcentaje de cumplimiento
+    impacto_calidad = datos['impacto_calidad']  # Impacto en calidad (0-10)
     
     x = np.arange(len(principios))
     width = 0.35
@@ -267,79 +350,93 @@ def fig6_impacto_solid():
         ax2.text(bar.get_x() + bar.get_width()/2, valor + 0.2, 
                 f'{valor:.1f}', ha='center', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/impacto_solid.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/impacto_solid.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 6 generada: impacto_solid")
+    return fig
 
 # ============================================================================
 # FIGURA 7: Reducción de Errores en Producción
 # ============================================================================
-def fig7_reduccion_errores():
+@figura('reduccion_errores', etiquetas=('lineas', 'serie-temporal'),
+        datos=('errores_mensuales', 'errores_resumen?'))
+def fig7_reduccion_errores(datos, resumen):
     fig, ax = plt.subplots(figsize=(9, 5))
     
-    meses = ['Mes 1\n(Monolito)', 'Mes 2', 'Mes 3\n(N-Capas)', 'Mes 4', 
-             'Mes 5', 'Mes 6\n(+Patrones)', 'Mes 7', 'Mes 8']
-    errores_criticos = [12, 10, 8, 5, 4, 2, 1, 1]
-    errores_medios = [25, 22, 18, 15, 10, 8, 5, 4]
-    errores_menores = [45, 40, 35, 28, 22, 15, 12, 10]
+    # Si existe el resumen de errorlogs.py (logs reales) se grafica en lugar
+    # de los datos incluidos
+    datos = resumen or datos
     
-    x = np.arange(len(meses))
+    meses = datos['meses']
+    errores_criticos = datos['criticos']
+    errores_medios = datos['medios']
+    errores_menores = datos['menores']
     
-    ax.plot(x, errores_criticos, marker='o', linewidth=2.5, markersize=8, 
-           label='Críticos', color='#e74c3c')
-    ax.plot(x, errores_medios, marker='s', linewidth=2.5, markersize=8, 
-           label='Medios', color='#f39c12')
-    ax.plot(x, errores_menores, marker='^', linewidth=2.5, markersize=8, 
-           label='Menores', color='#3498db')
+    x = np.arange(len(meses))
     
-    # Áreas de implementación
-    ax.axvspan(-0.5, 1.5, alpha=0.15, color='red', label='Fase Monolítica')
-    ax.axvspan(1.5, 4.5, alpha=0.15, color='orange', label='Fase N-Capas')
-    ax.axvspan(4.5, 7.5, alpha=0.15, color='green', label='Fase Patrones')
+    # Series largas: se reducen conservando la forma y se rasterizan
+    for serie, marcador, etiqueta, color in ((errores_criticos, 'o', 'Críticos', '#e74c3c'),
+                                             (errores_medios, 's', 'Medios', '#f39c12'),
+                                             (errores_menores, '^', 'Menores', '#3498db')):
+        diezmado.trazar(ax, x, serie, presupuesto=PUNTOS_POR_SERIE, marker=marcador,
+                        linewidth=2.5, markersize=8, label=etiqueta, color=color)
+    
+    # Áreas de implementación: tramos consecutivos de meses con la misma fase
+    fases = datos.get('fase', ())
+    colores_fase = ['red', 'orange', 'green', 'purple', 'gray']
+    inicio = 0
+    for i in range(1, len(fases) + 1):
+        if i == len(fases) or fases[i] != fases[inicio]:
+            if fases[inicio]:
+                ax.axvspan(inicio - 0.5, i - 0.5, alpha=0.15,
+                           color=colores_fase[len(ax.patches) % len(colores_fase)],
+                           label=f'Fase {fases[inicio]}')
+            inicio = i
     
     ax.set_xlabel('Período de Desarrollo', fontweight='bold')
     ax.set_ylabel('Número de Errores', fontweight='bold')
     ax.set_title('Evolución de Errores en Producción según Arquitectura', 
                  fontweight='bold', fontsize=12)
-    ax.set_xticks(x)
-    ax.set_xticklabels(meses, rotation=20, ha='right')
+    # Con muchos meses solo se rotula uno de cada ``paso``
+    paso = max(1, len(meses) // 12)
+    ax.set_xticks(x[::paso])
+    ax.set_xticklabels(meses[::paso], rotation=20, ha='right')
     ax.legend(loc='upper right', ncol=2)
     ax.grid(alpha=0.3, linestyle='--')
     
-    # Porcentaje de reducción total
-    total_inicial = sum([errores_criticos[0], errores_medios[0], errores_menores[0]])
-    total_final = sum([errores_criticos[-1], errores_medios[-1], errores_menores[-1]])
-    reduccion = ((total_inicial - total_final) / total_inicial) * 100
-    
-    ax.text(3.5, 50, f'Reducción Total: {reduccion:.0f}%', 
+    # Porcentaje de reducción total (lo trae el resumen de errorlogs.py, como
+    # reducción de la media diaria). Con los totales diarios del primer y el
+    # último mes se añade su IC 95 % bootstrap; el valor es el mismo
+    reduccion = datos.get('reduccion')
+    intervalo = ''
+    if 'diarios_inicio' in datos and 'diarios_fin' in datos:
+        estimacion = estadistica.reduccion_relativa(datos['diarios_inicio'], datos['diarios_fin'])
+        if reduccion is None:
+            reduccion = estimacion.valor
+        intervalo = f' (IC 95 %: {estimacion.inferior:.0f}–{estimacion.superior:.0f}%)'
+    elif reduccion is None:
+        total_inicial = sum([errores_criticos[0], errores_medios[0], errores_menores[0]])
+        total_final = sum([errores_criticos[-1], errores_medios[-1], errores_menores[-1]])
+        reduccion = ((total_inicial - total_final) / total_inicial) * 100
+    
+    ax.text((len(meses) - 1) / 2, max(errores_menores.max(), errores_medios.max(),
+                                      errores_criticos.max()) * 10 / 9,
+           f'Reducción Total: {reduccion:.0f}%{intervalo}', 
            bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7),
            fontweight='bold', fontsize=11)
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/reduccion_errores.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/reduccion_errores.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 7 generada: reduccion_errores")
+    return fig
 
 # ============================================================================
 # FIGURA 8: Comparativa de Arquitecturas (Radar)
 # ============================================================================
-def fig8_comparativa_arquitecturas():
+@figura('comparativa_arquitecturas', etiquetas=('radar', 'comparativa'),
+        datos=('arquitecturas',))
+def fig8_comparativa_arquitecturas(datos):
     fig, ax = plt.subplots(figsize=(10, 6), subplot_kw=dict(projection='polar'))
     
-    categorias = ['Mantenibilidad', 'Escalabilidad', 'Testabilidad', 
-                  'Desacoplamiento', 'Rendimiento', 'Complejidad\nInicial']
+    categorias = datos['categorias']
     num_vars = len(categorias)
     
     # Datos (escala 0-10)
-    arquitecturas = {
-        'Monolito': [4, 3, 3, 2, 8, 9],
-        'N-Capas': [7, 6, 8, 7, 7, 5],
-        'N-Capas+DDD': [9, 8, 9, 9, 6, 3],
-        'Microservicios': [9, 10, 8, 10, 5, 2]
-    }
+    arquitecturas = datos['puntuaciones']
     
     colores = {'Monolito': '#e74c3c', 'N-Capas': '#3498db', 
                'N-Capas+DDD': '#2ecc71', 'Microservicios': '#9b59b6'}
@@ -359,7 +456,7 @@ def fig8_comparativa_arquitecturas():
     
     # Dibujar cada arquitectura
     for nombre, valores in arquitecturas.items():
-        valores += valores[:1]  # Cerrar el polígono
+        valores = np.append(valores, valores[0])  # Cerrar el polígono
         ax.plot(angles, valores, 'o-', linewidth=2, label=nombre, 
                color=colores[nombre], markersize=6)
         ax.fill(angles, valores, alpha=0.15, color=colores[nombre])
@@ -368,22 +465,19 @@ def fig8_comparativa_arquitecturas():
                  fontweight='bold', fontsize=12, pad=20)
     ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/comparativa_arquitecturas.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/comparativa_arquitecturas.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 8 generada: comparativa_arquitecturas")
+    return fig
 
 # ============================================================================
 # FIGURA 9: Distribución de Módulos y Servicios
 # ============================================================================
-def fig9_distribucion_modulos():
+@figura('distribucion_modulos', etiquetas=('barras', 'multipanel'), datos=('modulos',))
+def fig9_distribucion_modulos(datos):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
     
     # Gráfica 1: Distribución por módulo
-    modulos = ['Seguridad', 'Operación', 'Parámetros', 'Geográfico', 'Base']
-    servicios = [12, 15, 5, 4, 3]
-    repositorios = [10, 14, 6, 4, 3]
+    modulos = datos['modulo']
+    servicios = datos['servicios']
+    repositorios = datos['repositorios']
     
     x = np.arange(len(modulos))
     width = 0.35
@@ -401,7 +495,7 @@ def fig9_distribucion_modulos():
     ax1.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Gráfica 2: Complejidad ciclomática promedio
-    complejidad = [8.5, 12.3, 6.2, 5.8, 4.5]
+    complejidad = datos['complejidad']
     colors = ['#ffffcc', '#ffeda0', '#fed976', '#feb24c', '#fd8d3c']
     
     bars = ax2.bar(modulos, complejidad, color=colors, alpha=0.8, edgecolor='black')
@@ -416,49 +510,64 @@ def fig9_distribucion_modulos():
         ax2.text(bar.get_x() + bar.get_width()/2, valor + 0.3, 
                 f'{valor:.1f}', ha='center', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/distribucion_modulos.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/distribucion_modulos.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 9 generada: distribucion_modulos")
+    return fig
 
 # ============================================================================
 # FIGURA 10: Rendimiento y Escalabilidad
 # ============================================================================
-def fig10_rendimiento_escalabilidad():
+@figura('rendimiento_escalabilidad', etiquetas=('lineas', 'multipanel', 'rendimiento'),
+        datos=('rendimiento', 'rendimiento_percentiles?'))
+def fig10_rendimiento_escalabilidad(datos, percentiles):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
     
+    # Variantes: (nombre en los logs, sufijo en rendimiento.csv, marcador, color).
+    # Si existe el resumen de loadtest.py se grafican sus percentiles; si no,
+    # los valores puntuales de rendimiento.csv
+    percentiles = percentiles or {}
+    variantes = [('Monolito', 'monolito', 'o', '#e74c3c'),
+                 ('N-Capas', 'ncapas', 's', '#3498db'),
+                 ('N-Capas + Patrones', 'optimizado', '^', '#2ecc71')]
+    variantes += [(nombre, None, 'D', None) for nombre in percentiles
+                  if nombre not in {v[0] for v in variantes}]
+    usuarios = datos['usuarios']
+    
     # Gráfica 1: Tiempo de respuesta vs Usuarios concurrentes
-    usuarios = [10, 50, 100, 200, 500, 1000, 2000]
-    tiempo_monolito = [120, 180, 350, 850, 2200, 5500, 12000]
-    tiempo_ncapas = [115, 160, 280, 520, 1100, 2200, 4500]
-    tiempo_optimizado = [110, 145, 240, 420, 850, 1500, 2800]
-    
-    ax1.plot(usuarios, tiempo_monolito, marker='o', linewidth=2.5, 
-            label='Monolito', color='#e74c3c')
-    ax1.plot(usuarios, tiempo_ncapas, marker='s', linewidth=2.5, 
-            label='N-Capas', color='#3498db')
-    ax1.plot(usuarios, tiempo_optimizado, marker='^', linewidth=2.5, 
-            label='N-Capas + Patrones', color='#2ecc71')
+    for nombre, columna, marcador, color in variantes:
+        if nombre in percentiles:
+            # Mediana con banda p50-p99 y p95 punteada
+            v = percentiles[nombre]
+            linea = diezmado.trazar(ax1, v['usuarios'], v['p50'], presupuesto=PUNTOS_POR_SERIE,
+                                    marker=marcador, linewidth=2.5,
+                                    label=f'{nombre} (p50)', color=color)
+            diezmado.banda(ax1, v['usuarios'], v['p50'], v['p99'], presupuesto=PUNTOS_POR_SERIE,
+                           alpha=0.15, color=linea.get_color())
+            diezmado.trazar(ax1, v['usuarios'], v['p95'], presupuesto=PUNTOS_POR_SERIE,
+                            linestyle=':', linewidth=1.5, color=linea.get_color())
+        elif columna is not None:
+            diezmado.trazar(ax1, usuarios, datos[f'tiempo_{columna}'],
+                            presupuesto=PUNTOS_POR_SERIE, marker=marcador, linewidth=2.5,
+                            label=nombre, color=color)
     
     ax1.set_xlabel('Usuarios Concurrentes', fontweight='bold')
     ax1.set_ylabel('Tiempo de Respuesta (ms)', fontweight='bold')
-    ax1.set_title('Escalabilidad: Tiempo de Respuesta', fontweight='bold')
+    ax1.set_title('Escalabilidad: Tiempo de Respuesta'
+                  + (' (banda p50–p99, p95 punteada)' if percentiles else ''),
+                  fontweight='bold')
     ax1.legend()
     ax1.grid(alpha=0.3, linestyle='--')
     ax1.set_yscale('log')
     
     # Gráfica 2: Uso de memoria
-    memoria_monolito = [180, 250, 380, 650, 1200, 2100, 3500]
-    memoria_ncapas = [150, 210, 320, 520, 880, 1400, 2200]
-    memoria_optimizado = [140, 195, 290, 450, 750, 1150, 1800]
-    
-    ax2.plot(usuarios, memoria_monolito, marker='o', linewidth=2.5, 
-            label='Monolito', color='#e74c3c')
-    ax2.plot(usuarios, memoria_ncapas, marker='s', linewidth=2.5, 
-            label='N-Capas', color='#3498db')
-    ax2.plot(usuarios, memoria_optimizado, marker='^', linewidth=2.5, 
-            label='N-Capas + Patrones', color='#2ecc71')
+    for nombre, columna, marcador, color in variantes:
+        if 'memoria_mb' in percentiles.get(nombre, {}):
+            v = percentiles[nombre]
+            x, memoria = v['usuarios'], np.array(v['memoria_mb'], dtype=float)
+        elif columna is not None:
+            x, memoria = usuarios, datos[f'memoria_{columna}']
+        else:
+            continue
+        diezmado.trazar(ax2, x, memoria, presupuesto=PUNTOS_POR_SERIE, marker=marcador,
+                        linewidth=2.5, label=nombre, color=color)
     
     ax2.set_xlabel('Usuarios Concurrentes', fontweight='bold')
     ax2.set_ylabel('Uso de Memoria (MB)', fontweight='bold')
@@ -466,32 +575,485 @@ def fig10_rendimiento_escalabilidad():
     ax2.legend()
     ax2.grid(alpha=0.3, linestyle='--')
     
-    plt.tight_layout()
-    plt.savefig(f'{output_dir}/rendimiento_escalabilidad.pdf', bbox_inches='tight')
-    plt.savefig(f'{output_dir}/rendimiento_escalabilidad.png', bbox_inches='tight')
-    plt.close()
-    print("✓ Figura 10 generada: rendimiento_escalabilidad")
+    return fig
 
 # ============================================================================
-# Ejecutar todas las funciones
+# Ejecución (secuencial o en paralelo)
 # ============================================================================
-if __name__ == "__main__":
+def _cargar_matplotlib():
+    """Importa matplotlib con el backend Agg (sin pantalla) y aplica el estilo.
+
+    Solo se llama cuando realmente hay figuras que renderizar, en el proceso
+    que las renderiza.
+    """
+    global matplotlib, plt, np, mpatches, diezmado, estadistica
+    if plt is not None:
+        return
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    import numpy as np
+    import diezmado
+    import estadistica
+    plt.rcParams.update(ESTILO)
+
+
+def _ejecutar_figura(nombre, formatos=FORMATOS, traza=False):
+    """Genera y exporta una figura capturando su salida por consola.
+
+    Se ejecuta tanto en el proceso principal como en los procesos del pool;
+    devuelve (nombre, ok, salida, error, eventos de traza) para que el
+    proceso principal imprima los resultados en un orden fijo.
+    """
+    if traza:
+        figtrace.activar()
+    salida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(salida), figtrace.fase(nombre, formatos=formatos):
+            with figtrace.fase('cargar matplotlib'):
+                _cargar_matplotlib()
+            figtrace.instrumentar()
+            figura = REGISTRO[nombre]
+            with figtrace.fase('cargar datos'):
+                datos = [datasets.cargar(d) for d in figura.datos]
+            with figtrace.fase('construir'):
+                fig = figura.funcion(*datos)
+            with figtrace.fase('tight_layout'):
+                fig.tight_layout()
+            with figtrace.fase('exportar'):
+                escritas = figexport.exportar(fig, os.path.join(output_dir, figura.salida),
+                                              formatos)
+            plt.close(fig)
+            print(f"✓ Figura {figura.numero} generada: {figura.salida}"
+                  + ("" if escritas else " (idéntica, no se reescribe)"))
+    except Exception:
+        if plt is not None:
+            plt.close('all')
+        return nombre, False, salida.getvalue(), traceback.format_exc(), figtrace.extraer()
+    return nombre, True, salida.getvalue(), '', figtrace.extraer()
+
+
+def _formatos_de(formatos, figura):
+    """``formatos`` es una tupla común a todas o un dict {nombre: tupla} por figura."""
+    return formatos[figura.nombre] if isinstance(formatos, dict) else formatos
+
+
+def generar_figuras(figuras, jobs=1, formatos=FORMATOS, traza=None):
+    """Genera las figuras indicadas y devuelve la lista de nombres que fallaron.
+
+    Con ``jobs > 1`` cada figura se renderiza en un proceso independiente; los
+    mensajes se muestran siempre en el orden de ``figuras``. Si ``traza`` es
+    una lista, se activa la instrumentación y se añaden a ella los eventos de
+    todos los procesos.
+    """
+    trazar = traza is not None
+    tareas = [(f.nombre, _formatos_de(formatos, f)) for f in figuras]
+    if jobs <= 1 or len(tareas) <= 1:
+        resultados = (_ejecutar_figura(n, fmt, trazar) for n, fmt in tareas)
+        return _reportar(resultados, traza)
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tareas)),
+                             initializer=_inicializar_proceso,
+                             initargs=(datasets.directorios(),)) as pool:
+        futuros = [(n, pool.submit(_ejecutar_figura, n, fmt, trazar)) for n, fmt in tareas]
+        return _reportar((_resultado(n, f) for n, f in futuros), traza)
+
+
+def _inicializar_proceso(directorios_datos):
+    # Con fork el hijo hereda los eventos ya registrados por el proceso
+    # principal; se descartan para no devolverlos duplicados
+    figtrace.extraer()
+    datasets.configurar(directorios_datos)
+    _cargar_matplotlib()
+
+
+def _resultado(nombre, futuro):
+    # Un proceso hijo que muere (p. ej. por falta de memoria) no debe
+    # impedir reportar el resto de figuras
+    try:
+        return futuro.result()
+    except Exception:
+        return nombre, False, '', traceback.format_exc(), []
+
+
+def _reportar(resultados, traza=None):
+    fallidas = []
+    for nombre, ok, salida, error, eventos in resultados:
+        if traza is not None:
+            traza.extend(eventos)
+        print(salida, end='')
+        if not ok:
+            print(f"✗ Error generando {nombre}:\n{error}")
+            fallidas.append(nombre)
+    return fallidas
+
+
+def seleccionar(patrones=(), etiquetas=()):
+    """Figuras registradas cuyo nombre o salida coincide con algún patrón glob.
+
+    Sin patrones se seleccionan todas; ``etiquetas`` filtra además por
+    cualquiera de las etiquetas indicadas.
+    """
+    figuras = list(REGISTRO.values())
+    if patrones:
+        figuras = [f for f in figuras
+                   if any(fnmatch.fnmatchcase(f.nombre, p) or fnmatch.fnmatchcase(f.salida, p)
+                          for p in patrones)]
+    if etiquetas:
+        figuras = [f for f in figuras if set(etiquetas) & set(f.etiquetas)]
+    return figuras
+
+
+def seleccion_latex(figuras):
+    """Restringe ``figuras`` a las que incluye el artículo, con sus formatos.
+
+    Devuelve ``(figuras, {nombre: formatos})``. Avisa de los gráficos
+    incluidos que no tienen generador y de las figuras que ningún documento
+    incluye.
+    """
+    graficos = os.path.abspath(output_dir)
+    refs = latexrefs.referencias(os.path.dirname(graficos), os.path.basename(graficos))
+
+    generadas = {f.salida for f in REGISTRO.values()}
+    for base in sorted(set(refs) - generadas):
+        for ext in sorted(refs[base]):
+            existe = os.path.exists(os.path.join(output_dir, f'{base}.{ext}'))
+            print(f"⚠ Incluida en LaTeX sin generador: {base}.{ext}"
+                  + ('' if existe else ' (el archivo no existe)'))
+
+    usadas, formatos = [], {}
+    for f in figuras:
+        exts = tuple(ext for ext in figexport.OPCIONES if ext in refs.get(f.salida, ()))
+        if not exts:
+            print(f"⚠ Ningún documento incluye {f.salida}: se omite {f.nombre}")
+            continue
+        usadas.append(f)
+        formatos[f.nombre] = exts
+    return usadas, formatos
+
+
+# ============================================================================
+# Caché incremental
+# ============================================================================
+def _salidas(figura, formatos=FORMATOS):
+    """Rutas de los archivos que escribe una figura."""
+    return [os.path.join(output_dir, f'{figura.salida}.{ext}') for ext in formatos]
+
+
+# Módulos auxiliares que intervienen en el resultado de cualquier figura
+AUXILIARES = ('datasets', 'diezmado', 'estadistica', 'figexport')
+
+
+def _huella_entorno():
+    """Huella de lo común a todas las figuras.
+
+    Cubre el código de los módulos auxiliares, el de _ejecutar_figura
+    (layout y exportación), la ruta y el contenido del matplotlibrc y el
+    valor de SOURCE_DATE_EPOCH (la fecha que se escribe en PDF y SVG). Solo
+    importa el paquete matplotlib, no pyplot, para localizar el matplotlibrc.
+    """
+    import matplotlib as mpl
+
+    codigo = os.path.dirname(os.path.abspath(__file__))
+    rutas = [os.path.join(codigo, f'{m}.py') for m in AUXILIARES] + [mpl.matplotlib_fname()]
+    contenidos = []
+    for ruta in rutas:
+        with open(ruta, encoding='utf-8', errors='replace') as f:
+            contenidos.append(f.read())
+    return figcache.huella(rutas[-1], contenidos, inspect.getsource(_ejecutar_figura),
+                           os.environ.get('SOURCE_DATE_EPOCH'))
+
+
+def _clave(figura, formato, entorno):
+    """Huella de todo lo que determina un archivo de salida de una figura.
+
+    Incluye el código fuente, el contenido de sus archivos de datos, el
+    estilo, las opciones del formato y ``entorno`` (ver _huella_entorno).
+    """
+    return figcache.huella(inspect.getsource(figura.funcion),
+                           [datasets.huella(d) for d in figura.datos],
+                           ESTILO, PUNTOS_POR_SERIE, figexport.OPCIONES[formato],
+                           metadata.version('matplotlib'), entorno)
+
+
+def _entrada(figura, formato):
+    """Entrada del manifiesto de un archivo de salida: una por (figura, formato)."""
+    return f'{figura.nombre}.{formato}'
+
+
+def generar_incremental(figuras, jobs=1, formatos=FORMATOS, forzar=False,
+                        simulado=False, traza=None):
+    """Genera solo los archivos cuya huella cambió; devuelve las figuras que fallaron.
+
+    Cada formato de cada figura tiene su propia huella: pedir un formato
+    más (o menos) no invalida los que ya están al día, y una figura solo
+    se renderiza en los formatos pendientes. ``formatos`` y ``traza``
+    admiten lo mismo que en generar_figuras. Con ``simulado`` solo informa
+    qué se generaría, sin renderizar ni tocar el manifiesto.
+    """
+    with figtrace.fase('comprobar caché', 'cache'):
+        manifiesto = figcache.cargar_manifiesto(output_dir)
+        entorno = _huella_entorno()
+        claves, pendientes = {}, {}
+        for f in figuras:
+            for ext in _formatos_de(formatos, f):
+                claves[_entrada(f, ext)] = _clave(f, ext, entorno)
+            pendientes[f.nombre] = tuple(
+                ext for ext in _formatos_de(formatos, f)
+                if forzar or not figcache.vigente(manifiesto, _entrada(f, ext),
+                                                  claves[_entrada(f, ext)], _salidas(f, (ext,))))
+            if not pendientes[f.nombre]:
+                print(f"↷ Sin cambios: {f.nombre}")
+        figuras = [f for f in figuras if pendientes[f.nombre]]
+
+    if simulado:
+        for f in figuras:
+            print(f"→ Se generaría: {f.nombre} ({', '.join(_salidas(f, pendientes[f.nombre]))})")
+        return []
+
+    with figtrace.fase('generar figuras', 'render', jobs=jobs, figuras=len(figuras)):
+        fallidas = generar_figuras(figuras, jobs=jobs, formatos=pendientes, traza=traza)
+
+    for f in figuras:
+        for ext in pendientes[f.nombre]:
+            if f.nombre in fallidas:
+                manifiesto.pop(_entrada(f, ext), None)
+            else:
+                manifiesto[_entrada(f, ext)] = claves[_entrada(f, ext)]
+    figcache.guardar_manifiesto(output_dir, manifiesto)
+    return fallidas
+
+
+# ============================================================================
+# Paquete combinado: todas las figuras en un solo PDF
+# ============================================================================
+PAQUETE = latexrefs.PAQUETE
+
+
+def rutas_paquete():
+    """(PDF combinado, mapa de páginas para LaTeX) dentro de output_dir."""
+    base = os.path.join(output_dir, PAQUETE)
+    return base + '.pdf', base + '.tex'
+
+
+def _escribir_mapa(ruta, figuras):
+    """Página de cada figura como macros ``\\csname figurapagina@<salida>\\endcsname``."""
+    lineas = ['% Generado por code/generate_figures.py: página de cada figura en '
+              f'{PAQUETE}.pdf (ver \\grafica en includes/preamble_common.tex)']
+    lineas += [f'\\expandafter\\def\\csname figurapagina@{f.salida}\\endcsname{{{pagina}}}'
+               for pagina, f in enumerate(figuras, start=1)]
+    contenido = '\n'.join(lineas) + '\n'
+    if os.path.exists(ruta):
+        with open(ruta, encoding='utf-8') as f:
+            if f.read() == contenido:
+                return
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+
+
+def _clave_paquete(figuras):
+    entorno = _huella_entorno()
+    return figcache.huella(*(_clave(f, 'pdf', entorno) for f in figuras))
+
+
+def paquete_desactualizado():
+    """True si el PDF combinado existe pero no refleja las figuras actuales."""
+    figuras = sorted(REGISTRO.values(), key=lambda f: f.numero)
+    rutas = rutas_paquete()
+    return (os.path.exists(rutas[0]) and not figcache.vigente(
+        figcache.cargar_manifiesto(output_dir), PAQUETE, _clave_paquete(figuras), rutas))
+
+
+def retirar_paquete(simulado=False):
+    """Borra el PDF combinado desactualizado y su mapa de páginas.
+
+    Sin el mapa, ``\\grafica`` vuelve a los PDF de cada figura, que sí están
+    al día; el paquete se recrea con el próximo ``render --bundle``.
+    """
+    if simulado:
+        print(f"→ Se eliminaría {PAQUETE}.pdf (desactualizado)")
+        return
+    for ruta in rutas_paquete():
+        if os.path.exists(ruta):
+            os.unlink(ruta)
+    manifiesto = figcache.cargar_manifiesto(output_dir)
+    if manifiesto.pop(PAQUETE, None) is not None:
+        figcache.guardar_manifiesto(output_dir, manifiesto)
+    print(f"⚠ {PAQUETE}.pdf no reflejaba los últimos cambios: se eliminó junto con "
+          f"{PAQUETE}.tex y \\grafica usa los PDF de cada figura (regenérelo con --bundle)")
+
+
+def generar_paquete(forzar=False):
+    """Genera el PDF combinado de todas las figuras registradas, una por página.
+
+    Las páginas comparten un solo subconjunto de cada fuente, así los
+    documentos incrustan la tipografía una vez en lugar de una por figura.
+    Si ninguna figura cambió no se reescribe, pero basta un cambio en una
+    para volver a renderizarlas todas (varios segundos), por eso solo se
+    genera cuando se pide (``render --bundle``). Devuelve True si terminó bien.
+    """
+    figuras = sorted(REGISTRO.values(), key=lambda f: f.numero)
+    ruta_pdf, ruta_mapa = rutas_paquete()
+    manifiesto = figcache.cargar_manifiesto(output_dir)
+    clave = _clave_paquete(figuras)
+    if not forzar and figcache.vigente(manifiesto, PAQUETE, clave, (ruta_pdf, ruta_mapa)):
+        print(f"↷ Sin cambios: {PAQUETE}.pdf")
+        return True
+
+    def paginas():
+        for f in figuras:
+            fig = f.funcion(*[datasets.cargar(d) for d in f.datos])
+            fig.tight_layout()
+            yield fig
+            plt.close(fig)
+
+    try:
+        with figtrace.fase('paquete', 'render', figuras=len(figuras)):
+            _cargar_matplotlib()
+            figexport.exportar_paginas(paginas(), ruta_pdf)
+    except Exception:
+        if plt is not None:
+            plt.close('all')
+        print(traceback.format_exc(), end='')
+        print(f"✗ Error al generar {PAQUETE}.pdf")
+        manifiesto.pop(PAQUETE, None)
+        figcache.guardar_manifiesto(output_dir, manifiesto)
+        return False
+    _escribir_mapa(ruta_mapa, figuras)
+    manifiesto[PAQUETE] = clave
+    figcache.guardar_manifiesto(output_dir, manifiesto)
+    print(f"✓ Paquete generado: {PAQUETE}.pdf ({len(figuras)} páginas)")
+    return True
+
+
+# ============================================================================
+# Interfaz de línea de comandos
+# ============================================================================
+COMANDOS = ('list', 'render')
+
+
+def _lista_formatos(valor):
+    formatos = tuple(f.strip().lower().lstrip('.') for f in valor.split(',') if f.strip())
+    desconocidos = [f for f in formatos if f not in figexport.OPCIONES]
+    if not formatos:
+        raise argparse.ArgumentTypeError('se requiere al menos un formato')
+    if desconocidos:
+        raise argparse.ArgumentTypeError(f"formato no soportado: {', '.join(desconocidos)}")
+    return formatos
+
+
+def _argumentos(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Sin subcomando se mantiene el comportamiento original: renderizar todo
+    if not argv or argv[0] not in COMANDOS + ('-h', '--help'):
+        argv = ['render'] + argv
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    listar = comandos.add_parser('list', help='Listar las figuras registradas')
+    renderizar = comandos.add_parser('render', help='Renderizar figuras (por defecto, todas)')
+    for sub in (listar, renderizar):
+        sub.add_argument('patrones', nargs='*', metavar='nombre|glob',
+                         help='Nombre de función o de salida; admite comodines (fig6_*)')
+        sub.add_argument('-t', '--tag', dest='etiquetas', action='append', default=[],
+                         help='Filtrar por etiqueta (repetible)')
+
+    renderizar.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                            help='Número de procesos para renderizar en paralelo '
+                                 '(por defecto: núcleos disponibles)')
+    renderizar.add_argument('--data-dir', action='append', default=[], metavar='DIR',
+                            help='Directorio con datos propios (csv/json/parquet) que '
+                                 'reemplazan a los de data/; repetible')
+    renderizar.add_argument('--formats', type=_lista_formatos, default=FORMATOS,
+                            metavar='EXT[,EXT...]',
+                            help='Formatos de salida: ' + ', '.join(figexport.OPCIONES)
+                                 + f" (por defecto: {','.join(FORMATOS)})")
+    renderizar.add_argument('--from-latex', action='store_true',
+                            help='Generar solo las figuras y formatos que incluyen los '
+                                 'main_*.tex (siguiendo \\input/\\include); ignora --formats')
+    renderizar.add_argument('--trace', metavar='TRAZA.json',
+                            help='Guardar una traza de tiempos por fase (Chrome trace, '
+                                 'abrir en ui.perfetto.dev)')
+    renderizar.add_argument('-f', '--force', action='store_true',
+                            help='Regenerar las figuras aunque no hayan cambiado')
+    renderizar.add_argument('-n', '--dry-run', action='store_true',
+                            help='Mostrar qué se generaría sin renderizar nada')
+    renderizar.add_argument('--bundle', action='store_true',
+                            help=f'Generar además {PAQUETE}.pdf con todas las figuras (una por '
+                                 'página y fuentes compartidas); vuelve a renderizar las diez '
+                                 'si cambia cualquiera, así que solo se actualiza con esta opción')
+    renderizar.add_argument('-w', '--watch', action='store_true',
+                            help='Tras generar, seguir observando el script, los datos y '
+                                 'el matplotlibrc y regenerar al vuelo lo que cambie')
+    args = parser.parse_args(argv)
+    if args.comando == 'render' and args.watch and args.dry_run:
+        parser.error('--watch y --dry-run no se pueden combinar')
+    return args
+
+
+def main(argv=None):
+    args = _argumentos(argv)
+    figuras = seleccionar(args.patrones, args.etiquetas)
+    if not figuras:
+        print(f"No hay figuras que coincidan con: {' '.join(args.patrones + args.etiquetas)}",
+              file=sys.stderr)
+        return 2
+
+    if args.comando == 'list':
+        for f in figuras:
+            print(f"{f.nombre:<34} {f.salida}.{{{','.join(FORMATOS)}}}"
+                  f"  [{', '.join(f.etiquetas)}]")
+        return 0
+
     print("\n" + "="*60)
     print("Generando gráficas para el artículo...")
     print("="*60 + "\n")
-    
-    fig1_metricas_componentes()
-    fig2_comparativa_tiempos()
-    fig3_cobertura_pruebas()
-    fig4_evolucion_arquitectura()
-    fig5_uso_patrones()
-    fig6_impacto_solid()
-    fig7_reduccion_errores()
-    fig8_comparativa_arquitecturas()
-    fig9_distribucion_modulos()
-    fig10_rendimiento_escalabilidad()
-    
+
+    datasets.configurar(args.data_dir)
+    formatos = args.formats
+    if args.from_latex:
+        figuras, formatos = seleccion_latex(figuras)
+
+    traza = None
+    if args.trace:
+        traza = []
+        figtrace.activar()
+
+    fallidas = generar_incremental(figuras, jobs=args.jobs, formatos=formatos,
+                                   forzar=args.force, simulado=args.dry_run, traza=traza)
+
+    if args.bundle and not args.dry_run:
+        if not generar_paquete(forzar=args.force):
+            fallidas.append(PAQUETE)
+    elif paquete_desactualizado():
+        retirar_paquete(simulado=args.dry_run)
+
+    if traza is not None:
+        figtrace.escribir(args.trace, traza + figtrace.extraer())
+
+    if args.watch:
+        def seleccion(modulo):
+            figuras = modulo.seleccionar(args.patrones, args.etiquetas)
+            if args.from_latex:
+                return modulo.seleccion_latex(figuras)
+            return figuras, args.formats
+        return figwatch.observar(sys.modules[__name__], seleccion)
+
     print("\n" + "="*60)
-    print("✅ Todas las gráficas generadas exitosamente")
+    if fallidas:
+        print(f"❌ {len(fallidas)} de {len(figuras)} gráficas fallaron: "
+              + ", ".join(fallidas))
+    elif not args.dry_run:
+        print("✅ Todas las gráficas generadas exitosamente")
     print(f"📁 Ubicación: {os.path.abspath(output_dir)}")
     print("="*60 + "\n")
+    return 1 if fallidas else 0
+
+
+# ============================================================================
+# Ejecutar todas las funciones
+# ============================================================================
+if __name__ == "__main__":
+    sys.exit(main())
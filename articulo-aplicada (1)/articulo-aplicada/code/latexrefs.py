@@ -0,0 +1,78 @@
+"""
+Análisis de las fuentes LaTeX para saber qué gráficas usa realmente el artículo.
+
+Parte de los documentos principales (``main_*.tex``), sigue ``\\input`` e
+``\\include`` y recoge cada ``\\includegraphics`` con su extensión, además de
+cada ``\\grafica{nombre}`` (figura generada, ver includes/preamble_common.tex),
+que cuenta como ``graphics/nombre.pdf``. Así el generador puede renderizar
+solo las figuras y formatos que algún documento incluye.
+
+Se ignoran los argumentos con parámetros de macro (``#2``), que solo
+aparecen en definiciones como la de ``\\grafica``, y el PDF combinado
+``graphics/figuras.pdf``, que es una salida del generador y no una inclusión
+de la que haya que generar algo.
+"""
+
+import glob
+import os
+import re
+
+_COMENTARIO = re.compile(r'(?<!\\)%.*')
+_INCLUSION = re.compile(r'\\(?:input|include)\s*\{([^}]+)\}')
+_GRAFICO = re.compile(r'\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+_GRAFICA = re.compile(r'\\grafica\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+
+# Con una ruta sin extensión, graphicx (xelatex) prueba primero .pdf
+EXTENSION_POR_DEFECTO = 'pdf'
+
+# Nombre base del PDF combinado de figuras (generate_figures.py render --bundle)
+PAQUETE = 'figuras'
+
+
+def _leer(ruta):
+    with open(ruta, encoding='utf-8', errors='replace') as f:
+        return _COMENTARIO.sub('', f.read())
+
+
+def _resolver_tex(raiz, nombre):
+    ruta = os.path.join(raiz, nombre.strip())
+    if not os.path.splitext(ruta)[1]:
+        ruta += '.tex'
+    return os.path.normpath(ruta)
+
+
+def archivos_tex(raiz, principales='main_*.tex'):
+    """Archivos .tex alcanzables desde los documentos principales, sin repetir."""
+    pendientes = sorted(glob.glob(os.path.join(raiz, principales)))
+    vistos = []
+    while pendientes:
+        ruta = os.path.normpath(pendientes.pop(0))
+        if ruta in vistos or not os.path.exists(ruta):
+            continue
+        vistos.append(ruta)
+        # Las rutas de \input son relativas a la raíz de compilación, no al archivo
+        pendientes.extend(_resolver_tex(raiz, m) for m in _INCLUSION.findall(_leer(ruta)))
+    return vistos
+
+
+def referencias(raiz, directorio='graphics', principales='main_*.tex'):
+    """Gráficos de ``directorio`` incluidos por el artículo.
+
+    Devuelve ``{nombre base: {extensiones}}``; una inclusión sin extensión
+    cuenta como ``EXTENSION_POR_DEFECTO``.
+    """
+    usados = {}
+    for ruta in archivos_tex(raiz, principales):
+        texto = _leer(ruta)
+        generadas = [f'{directorio}/{n.strip()}.pdf' for n in _GRAFICA.findall(texto)]
+        for grafico in _GRAFICO.findall(texto) + generadas:
+            if '#' in grafico:
+                continue
+            carpeta, archivo = os.path.split(os.path.normpath(grafico.strip()))
+            if carpeta != os.path.normpath(directorio):
+                continue
+            base, ext = os.path.splitext(archivo)
+            if base == PAQUETE:
+                continue
+            usados.setdefault(base, set()).add(ext.lstrip('.').lower() or EXTENSION_POR_DEFECTO)
+    return usados
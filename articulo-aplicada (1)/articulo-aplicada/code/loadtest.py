@@ -0,0 +1,252 @@
+"""
+Ingesta de logs de pruebas de carga para la Figura 10 (rendimiento y escalabilidad).
+
+Lee logs de peticiones (JSONL o CSV, opcionalmente .gz) por bloques y agrupa
+las muestras por variante de arquitectura y nivel de concurrencia. Para cada
+grupo mantiene un histograma logarítmico de latencias de tamaño fijo (al
+estilo HDR: ~1 % de error relativo), así que la memoria no depende del tamaño
+del log. Al final escribe un resumen con p50/p95/p99 por grupo en
+``data/rendimiento_percentiles.json``, que la Figura 10 usa si existe.
+
+Uso:
+    python loadtest.py carga-*.jsonl
+    python loadtest.py carga.csv --latency-field duration_ms -o ../data/rendimiento_percentiles.json
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+import escritura
+
+# Rango y resolución del histograma de latencias (milisegundos)
+LATENCIA_MIN = 1e-3
+LATENCIA_MAX = 1e7
+PRECISION = 0.01
+PERCENTILES = (50, 95, 99)
+
+_PASO = math.log1p(PRECISION)
+_NUM_BINS = int(math.ceil(math.log(LATENCIA_MAX / LATENCIA_MIN) / _PASO)) + 1
+
+SALIDA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data',
+                      'rendimiento_percentiles.json')
+
+
+class ResumenCarga:
+    """Histogramas de latencia y memoria media por (variante, usuarios)."""
+
+    def __init__(self):
+        self.grupos = {}        # (variante, usuarios) -> índice de fila
+        self.conteos = np.zeros((0, _NUM_BINS), dtype=np.int64)
+        self.memoria_suma = np.zeros(0)
+        self.memoria_n = np.zeros(0, dtype=np.int64)
+        self.invalidas = {}     # ruta -> líneas que no se pudieron leer
+
+    def _indices(self, variantes, usuarios):
+        """Índice de grupo global de cada muestra, creando grupos nuevos si hace falta."""
+        nombres, idx_variante = np.unique(variantes, return_inverse=True)
+        niveles, idx_usuarios = np.unique(usuarios, return_inverse=True)
+        pares, idx_par = np.unique(idx_variante * len(niveles) + idx_usuarios,
+                                   return_inverse=True)
+        globales = np.empty(len(pares), dtype=np.int64)
+        for i, par in enumerate(pares):
+            clave = (str(nombres[par // len(niveles)]), int(niveles[par % len(niveles)]))
+            globales[i] = self.grupos.setdefault(clave, len(self.grupos))
+        self._crecer(len(self.grupos))
+        return globales[idx_par]
+
+    def _crecer(self, n):
+        faltan = n - len(self.conteos)
+        if faltan > 0:
+            self.conteos = np.vstack([self.conteos, np.zeros((faltan, _NUM_BINS), np.int64)])
+            self.memoria_suma = np.concatenate([self.memoria_suma, np.zeros(faltan)])
+            self.memoria_n = np.concatenate([self.memoria_n, np.zeros(faltan, np.int64)])
+
+    def agregar(self, variantes, usuarios, latencias, memoria=None):
+        """Acumula un bloque de muestras (arrays de igual longitud).
+
+        Las muestras sin variante (campo ausente o vacío) o sin latencia o
+        nivel de usuarios válidos (vacíos o no numéricos) se descartan;
+        devuelve cuántas.
+        """
+        crudas = np.asarray(variantes, dtype=object)
+        variantes = crudas.astype(str)
+        usuarios = _a_float(usuarios)
+        latencias = _a_float(latencias)
+        memoria = None if memoria is None else _a_float(memoria)
+        validas = ((crudas != None) & (np.char.strip(variantes) != '')  # noqa: E711
+                   & np.isfinite(latencias) & (latencias >= 0) & np.isfinite(usuarios))
+        if not validas.all():
+            variantes, usuarios, latencias = variantes[validas], usuarios[validas], latencias[validas]
+            memoria = None if memoria is None else memoria[validas]
+        descartadas = len(validas) - len(latencias)
+        if len(latencias) == 0:
+            return descartadas
+
+        grupo = self._indices(variantes, usuarios.astype(np.int64))
+        acotadas = np.clip(latencias, LATENCIA_MIN, LATENCIA_MAX)
+        bins = (np.log(acotadas / LATENCIA_MIN) / _PASO).astype(np.int64)
+        n = len(self.conteos)
+        self.conteos += np.bincount(grupo * _NUM_BINS + bins,
+                                    minlength=n * _NUM_BINS).reshape(n, _NUM_BINS)
+
+        if memoria is not None:
+            con_dato = np.isfinite(memoria)
+            self.memoria_suma += np.bincount(grupo[con_dato], weights=memoria[con_dato],
+                                             minlength=n)
+            self.memoria_n += np.bincount(grupo[con_dato], minlength=n)
+        return descartadas
+
+    def percentiles(self, qs=PERCENTILES):
+        """Matriz (grupos x percentiles) de latencias en ms."""
+        acumulado = np.cumsum(self.conteos, axis=1)
+        objetivos = acumulado[:, -1:] * (np.asarray(qs, dtype=float) / 100.0)
+        # Primer bin cuyo acumulado alcanza cada objetivo, para todos los grupos a la vez
+        bins = (acumulado[:, :, None] < objetivos[:, None, :]).sum(axis=1)
+        return LATENCIA_MIN * np.exp((bins + 0.5) * _PASO)
+
+    def resumen(self):
+        """Diccionario serializable: {variante: {usuarios, p50, p95, p99, muestras, memoria_mb}}."""
+        pct = self.percentiles()
+        muestras = self.conteos.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            memoria = self.memoria_suma / self.memoria_n
+        salida = {}
+        for (variante, usuarios), i in sorted(self.grupos.items(), key=lambda kv: kv[0]):
+            v = salida.setdefault(variante, {'usuarios': [], 'muestras': [], 'memoria_mb': [],
+                                             **{f'p{q}': [] for q in PERCENTILES}})
+            v['usuarios'].append(usuarios)
+            v['muestras'].append(int(muestras[i]))
+            v['memoria_mb'].append(round(float(memoria[i]), 3) if self.memoria_n[i] else None)
+            for j, q in enumerate(PERCENTILES):
+                v[f'p{q}'].append(round(float(pct[i, j]), 3))
+        for v in salida.values():
+            if all(m is None for m in v['memoria_mb']):
+                del v['memoria_mb']
+        return salida
+
+
+# ============================================================================
+# Lectura por bloques
+# ============================================================================
+def _float(valor):
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _a_float(valores):
+    """Convierte una columna a float; vacíos, nulos y no numéricos pasan a NaN."""
+    try:
+        return np.asarray(valores, dtype=float)
+    except (TypeError, ValueError):
+        return np.array([_float(v) for v in valores], dtype=float)
+
+
+def _abrir(ruta):
+    if ruta.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(ruta, 'rb'), encoding='utf-8', newline='')
+    return open(ruta, encoding='utf-8', newline='')
+
+
+def _registro(linea):
+    """Objeto JSON de una línea, o None si está mal formada (p. ej. truncada)."""
+    try:
+        registro = json.loads(linea)
+    except ValueError:
+        return None
+    return registro if isinstance(registro, dict) else None
+
+
+def _bloques_jsonl(f, campos, tamano):
+    """Bloques de columnas y, con cada uno, cuántas de sus líneas se descartaron."""
+    while True:
+        lineas = f.readlines(tamano)
+        if not lineas:
+            return
+        leidos = [_registro(l) for l in lineas if l.strip()]
+        registros = [r for r in leidos if r is not None]
+        yield [[r.get(c) for r in registros] for c in campos], len(leidos) - len(registros)
+
+
+def _bloques_csv(f, campos, tamano):
+    lector = csv.reader(f)
+    cabecera = next(lector)
+    faltan = [c for c in campos[:3] if c not in cabecera]
+    if faltan:
+        raise ValueError(f"Columnas no encontradas en el CSV: {', '.join(faltan)}")
+    # La memoria es opcional: si la columna no existe se ignora
+    posiciones = [cabecera.index(c) if c in cabecera else None for c in campos]
+    filas_por_bloque = max(1, tamano // 64)   # ~64 bytes por fila
+    necesarias = max(p for p in posiciones if p is not None) + 1
+    while True:
+        leidas = [fila for _, fila in zip(range(filas_por_bloque), lector)]
+        if not leidas:
+            return
+        # Una fila truncada no tiene todas las columnas: se descarta
+        filas = [fila for fila in leidas if len(fila) >= necesarias]
+        yield ([[fila[p] for fila in filas] if p is not None else None for p in posiciones],
+               len(leidas) - len(filas))
+
+
+def ingerir(rutas, campo_variante='arquitectura', campo_usuarios='usuarios',
+            campo_latencia='latencia_ms', campo_memoria='memoria_mb',
+            tamano_bloque=8 << 20):
+    """Procesa los logs indicados y devuelve el ResumenCarga acumulado.
+
+    Las líneas mal formadas (JSON inválido, filas CSV incompletas) y las
+    muestras sin latencia o usuarios numéricos se descartan y se cuentan por
+    archivo en ``ResumenCarga.invalidas``.
+    """
+    resumen = ResumenCarga()
+    campos = (campo_variante, campo_usuarios, campo_latencia, campo_memoria)
+    for ruta in rutas:
+        es_csv = ruta.removesuffix('.gz').endswith('.csv')
+        with _abrir(ruta) as f:
+            bloques = (_bloques_csv if es_csv else _bloques_jsonl)(f, campos, tamano_bloque)
+            for (variantes, usuarios, latencias, memoria), invalidas in bloques:
+                invalidas += resumen.agregar(variantes, usuarios, latencias, memoria)
+                if invalidas:
+                    resumen.invalidas[ruta] = resumen.invalidas.get(ruta, 0) + invalidas
+    return resumen
+
+
+def guardar(resumen, ruta):
+    """Escribe el resumen como JSON de forma atómica."""
+    escritura.escribir_json(ruta, resumen, ensure_ascii=False, indent=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('logs', nargs='+', help='Logs de peticiones (.jsonl/.csv, admite .gz)')
+    parser.add_argument('-o', '--output', default=SALIDA,
+                        help='Archivo de resumen (por defecto: data/rendimiento_percentiles.json)')
+    parser.add_argument('--variant-field', default='arquitectura')
+    parser.add_argument('--users-field', default='usuarios')
+    parser.add_argument('--latency-field', default='latencia_ms')
+    parser.add_argument('--memory-field', default='memoria_mb',
+                        help="Campo de memoria por muestra ('' si el log no lo tiene)")
+    args = parser.parse_args(argv)
+
+    carga = ingerir(args.logs, args.variant_field, args.users_field,
+                    args.latency_field, args.memory_field or None)
+    for ruta, n in carga.invalidas.items():
+        print(f"⚠ {ruta}: líneas mal formadas o sin datos válidos descartadas: {n}")
+    resumen = carga.resumen()
+    guardar(resumen, args.output)
+    for variante, v in resumen.items():
+        print(f"✓ {variante}: {len(v['usuarios'])} niveles, {sum(v['muestras'])} muestras")
+    print(f"📁 Resumen: {os.path.abspath(args.output)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Pruebas del agregador de logs de errores (code/errorlogs.py)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'code'))
+
+import errorlogs  # noqa: E402
+
+LOG = """\
+2024-05-01 10:00:00 INFO user typed WARN in the form
+2024-05-01 10:00:01,250 DEBUG retry after ERROR
+2024-05-01 10:00:02 TRACE FATAL path not taken
+2024-05-01 10:00:03 ERROR database timeout
+[2024-05-01T10:00:04.120Z] [WARN] slow response
+2024-05-02T08:00:00+02:00 FATAL out of memory
+2024-05-02 08:00:01 INFO request ok
+"""
+
+
+def test_contar_usa_el_nivel_de_la_linea(tmp_path):
+    ruta = tmp_path / 'app.log'
+    ruta.write_text(LOG)
+
+    conteos = errorlogs.contar([str(ruta)])
+
+    mes = 2024 * 12 + 4
+    assert sorted(conteos) == [mes * 31, mes * 31 + 1]
+    assert conteos[mes * 31].tolist() == [0, 1, 1]
+    assert conteos[mes * 31 + 1].tolist() == [1, 0, 0]
+
+
+def test_contar_ignora_logs_solo_informativos(tmp_path):
+    ruta = tmp_path / 'app.log'
+    ruta.write_text('2024-05-01 10:00:00 INFO ERROR in user input\n'
+                    '2024-05-01 10:00:01 DEBUG WARN\n')
+
+    conteos = errorlogs.contar([str(ruta)])
+
+    assert list(conteos) == [(2024 * 12 + 4) * 31]
+    assert conteos[(2024 * 12 + 4) * 31].tolist() == [0, 0, 0]
+
+
+def test_resumen_usa_solo_los_dias_cubiertos(tmp_path):
+    # El log empieza el 20 de mayo y termina el 2 de julio (con un día sin errores)
+    ruta = tmp_path / 'app.log'
+    ruta.write_text('2024-05-20 10:00:00 ERROR a\n'
+                    '2024-05-20 10:00:01 ERROR b\n'
+                    '2024-05-21 10:00:00 INFO ok\n'
+                    '2024-06-10 10:00:00 WARN c\n'
+                    '2024-07-02 10:00:00 ERROR d\n')
+
+    datos = errorlogs.resumen(errorlogs.contar([str(ruta)]))
+
+    assert datos['diarios_inicio'] == [2] + [0] * 11
+    assert datos['diarios_fin'] == [0, 1]
+    # Media diaria 2/12 antes, 1/2 después
+    assert datos['reduccion'] == round((2 / 12 - 1 / 2) / (2 / 12) * 100, 2)
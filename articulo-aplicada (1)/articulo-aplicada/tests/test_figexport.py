@@ -0,0 +1,33 @@
+"""Pruebas de la exportación multiformato (code/figexport.py)."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'code'))
+
+import figexport  # noqa: E402
+
+matplotlib = pytest.importorskip('matplotlib')
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+
+def test_exportar_dibuja_una_vez_por_formato(tmp_path, monkeypatch):
+    dibujos = []
+    original = Figure.draw
+    monkeypatch.setattr(Figure, 'draw', lambda fig, r: dibujos.append(r) or original(fig, r))
+    fig, ax = plt.subplots()
+    ax.plot([1, 2, 3])
+    ax.set_title('Prueba')
+    fig.tight_layout()
+
+    escritas = figexport.exportar(fig, str(tmp_path / 'fig'), ('pdf', 'png'))
+    plt.close(fig)
+
+    assert sorted(os.path.basename(r) for r in escritas) == ['fig.pdf', 'fig.png']
+    # Una para la caja ajustada y una por formato
+    assert len(dibujos) == 3
@@ -0,0 +1,227 @@
+"""
+Compilación del artículo: datos -> figuras -> PDFs IEEE, ACM y APA7.
+
+1. Regenera, de forma incremental, las figuras que incluyen los documentos
+   (``code/generate_figures.py render --from-latex``); una figura sin
+   cambios en su código o sus datos no se vuelve a escribir.
+2. Compila en paralelo los documentos cuyas entradas cambiaron, cada uno
+   con su propio directorio auxiliar (``build/aux/<formato>``) para que las
+   tres compilaciones no se pisen en ``build/``. Los PDFs quedan en
+   ``build/`` como antes.
+
+Las entradas de cada documento son los .tex alcanzables desde su ``main``
+(siguiendo ``\\input``/``\\include``), los gráficos que incluye, la
+bibliografía y ``latexmkrc``. Su huella se guarda en
+``build/.buildstamp.json``; un documento con la misma huella y su PDF en
+``build/`` no se recompila.
+
+Uso:
+    python tools/build.py                 # todo lo que haga falta
+    python tools/build.py ieee acm        # solo esos formatos
+    python tools/build.py --force         # recompilar aunque no haya cambios
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+RAIZ = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+CODIGO = os.path.join(RAIZ, 'code')
+SALIDA = 'build'
+SELLOS = os.path.join(SALIDA, '.buildstamp.json')
+TEXLIVE = '/opt/texlive/bin'
+
+sys.path.insert(0, CODIGO)
+import escritura  # noqa: E402
+import latexrefs  # noqa: E402
+
+
+@dataclass(frozen=True)
+class Documento:
+    nombre: str
+    principal: str        # main_*.tex
+    opciones: tuple = ()  # opciones de latexmk propias del formato
+
+    @property
+    def pdf(self):
+        return os.path.join(SALIDA, os.path.splitext(self.principal)[0] + '.pdf')
+
+    @property
+    def auxiliar(self):
+        return os.path.join(SALIDA, 'aux', self.nombre)
+
+    def comando(self):
+        return ['latexmk', '-silent', '-file-line-error', f'-outdir={SALIDA}',
+                f'-auxdir={self.auxiliar}', '-xelatex', *self.opciones, self.principal]
+
+
+# IEEE y APA7 usan biblatex + biber; ACM, natbib + BibTeX
+DOCUMENTOS = {
+    'ieee': Documento('ieee', 'main_ieee.tex'),
+    'acm': Documento('acm', 'main_acm.tex', ('-bibtex',)),
+    'apa7': Documento('apa7', 'main_apa7.tex'),
+}
+
+
+# ============================================================================
+# Grafo de dependencias
+# ============================================================================
+def _hash_archivo(ruta):
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def entradas(doc):
+    """Archivos de los que depende el PDF de ``doc`` (rutas relativas a la raíz)."""
+    rutas = [os.path.relpath(r, RAIZ) for r in latexrefs.archivos_tex(RAIZ, doc.principal)]
+    for base, extensiones in latexrefs.referencias(RAIZ, principales=doc.principal).items():
+        rutas.extend(os.path.join('graphics', f'{base}.{ext}') for ext in sorted(extensiones))
+    # PDF combinado de figuras (render --bundle): \\grafica lo usa si existe
+    rutas.extend(r for r in (f'graphics/{latexrefs.PAQUETE}.pdf', f'graphics/{latexrefs.PAQUETE}.tex')
+                 if os.path.exists(os.path.join(RAIZ, r)))
+    rutas.extend(os.path.relpath(r, RAIZ)
+                 for r in sorted(glob.glob(os.path.join(RAIZ, 'bibliography', '*'))))
+    rutas.append('latexmkrc')
+    return rutas
+
+
+def clave(doc):
+    """Huella de las entradas y del comando de ``doc``; un archivo ausente cuenta como tal."""
+    h = hashlib.sha256(json.dumps(doc.comando()).encode())
+    for ruta in entradas(doc):
+        absoluta = os.path.join(RAIZ, ruta)
+        h.update(ruta.encode() + b'\0')
+        h.update((_hash_archivo(absoluta) if os.path.exists(absoluta) else '-').encode())
+    return h.hexdigest()
+
+
+def _cargar_sellos():
+    try:
+        with open(os.path.join(RAIZ, SELLOS), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar_sellos(sellos):
+    escritura.escribir_json(os.path.join(RAIZ, SELLOS), sellos,
+                            indent=2, sort_keys=True)
+
+
+# ============================================================================
+# Etapas
+# ============================================================================
+def generar_figuras(forzar=False):
+    """Etapa datos -> figuras; devuelve True si terminó bien."""
+    comando = [sys.executable, 'generate_figures.py', 'render', '--from-latex']
+    if forzar:
+        comando.append('--force')
+    # Si se usa el PDF combinado, \\grafica lo lee: se mantiene al día en vez
+    # de dejar que render lo retire
+    if os.path.exists(os.path.join(RAIZ, 'graphics', f'{latexrefs.PAQUETE}.pdf')):
+        comando.append('--bundle')
+    print("[build] Figuras")
+    # generate_figures escribe en ../graphics, relativo a code/
+    return subprocess.run(comando, cwd=CODIGO).returncode == 0
+
+
+def compilar(doc, entorno):
+    """Ejecuta latexmk para ``doc``; devuelve (doc, ok, segundos, salida)."""
+    os.makedirs(os.path.join(RAIZ, doc.auxiliar), exist_ok=True)
+    inicio = time.perf_counter()
+    try:
+        proceso = subprocess.run(doc.comando(), cwd=RAIZ, env=entorno, text=True,
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except FileNotFoundError:
+        return doc, False, 0.0, 'latexmk no está instalado o no está en el PATH\n'
+    return doc, proceso.returncode == 0, time.perf_counter() - inicio, proceso.stdout
+
+
+def compilar_documentos(documentos, forzar=False, jobs=None, simulado=False):
+    """Etapa figuras -> PDFs; devuelve la lista de documentos que fallaron."""
+    os.makedirs(os.path.join(RAIZ, SALIDA), exist_ok=True)
+    sellos = _cargar_sellos()
+    claves = {d.nombre: clave(d) for d in documentos}
+    pendientes = []
+    for d in documentos:
+        if (not forzar and sellos.get(d.nombre) == claves[d.nombre]
+                and os.path.exists(os.path.join(RAIZ, d.pdf))):
+            print(f"↷ Sin cambios: {d.pdf}")
+        else:
+            pendientes.append(d)
+    if simulado:
+        for d in pendientes:
+            print(f"→ Se compilaría: {d.pdf}")
+        return []
+    if not pendientes:
+        return []
+
+    entorno = dict(os.environ)
+    if os.path.isdir(TEXLIVE):
+        entorno['PATH'] = TEXLIVE + os.pathsep + entorno.get('PATH', '')
+    print(f"[build] Compilando {', '.join(d.nombre.upper() for d in pendientes)}")
+    fallidos = []
+    with ThreadPoolExecutor(max_workers=jobs or len(pendientes)) as pool:
+        resultados = pool.map(lambda d: compilar(d, entorno), pendientes)
+        for doc, ok, segundos, salida in resultados:
+            if ok:
+                print(f"✓ {doc.pdf} ({segundos:.1f} s)")
+                sellos[doc.nombre] = claves[doc.nombre]
+            else:
+                print(salida, end='')
+                print(f"✗ {doc.principal} falló")
+                sellos.pop(doc.nombre, None)
+                fallidos.append(doc.nombre)
+    _guardar_sellos(sellos)
+    return fallidos
+
+
+# ============================================================================
+# Interfaz de línea de comandos
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('formatos', nargs='*', metavar='formato',
+                        help=f"Documentos a compilar: {', '.join(DOCUMENTOS)} (por defecto, todos)")
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='Compilaciones simultáneas (por defecto, una por documento)')
+    parser.add_argument('-f', '--force', action='store_true',
+                        help='Regenerar figuras y recompilar aunque nada haya cambiado')
+    parser.add_argument('--no-figures', action='store_true',
+                        help='No regenerar las figuras (usar las de graphics/ tal cual)')
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help='Mostrar qué documentos se compilarían, sin compilar')
+    args = parser.parse_args(argv)
+    desconocidos = [f for f in args.formatos if f not in DOCUMENTOS]
+    if desconocidos:
+        parser.error(f"formato desconocido: {', '.join(desconocidos)}")
+
+    os.chdir(RAIZ)
+    documentos = [DOCUMENTOS[f] for f in args.formatos or DOCUMENTOS]
+    inicio = time.perf_counter()
+    if not args.no_figures and not args.dry_run:
+        if not generar_figuras(args.force):
+            print("[build] Error al generar las figuras; no se compila", file=sys.stderr)
+            return 1
+
+    fallidos = compilar_documentos(documentos, forzar=args.force, jobs=args.jobs,
+                                   simulado=args.dry_run)
+    if fallidos:
+        print(f"[build] ❌ Fallaron: {', '.join(fallidos)}")
+        return 1
+    print(f"[build] PDFs disponibles en {SALIDA}/ ({time.perf_counter() - inicio:.1f} s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())